@@ -0,0 +1,68 @@
+"""Return/advantage kernels shared by agent updates.
+
+Inputs are contiguous float32 arrays; `dones` marks terminal steps (1.0/0.0).
+"""
+
+import numpy as np
+
+from src.utils.jit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True)
+def gae(rewards, values, dones, gamma, lam):
+    """Generalized Advantage Estimation.
+
+    `values` has length T+1; the last entry bootstraps the final step.
+    Returns (advantages, returns), each of length T.
+    """
+    T = rewards.shape[0]
+    advantages = np.zeros(T, dtype=np.float32)
+    last = 0.0
+    for t in range(T - 1, -1, -1):
+        nonterminal = 1.0 - dones[t]
+        delta = rewards[t] + gamma * values[t + 1] * nonterminal - values[t]
+        last = delta + gamma * lam * nonterminal * last
+        advantages[t] = last
+    return advantages, advantages + values[:T]
+
+
+@njit(cache=True, fastmath=True)
+def nstep_returns(rewards, next_values, dones, gamma, n):
+    """n-step discounted returns bootstrapped from `next_values`.
+
+    `next_values[t]` is the value estimate of the observation after step t.
+    Bootstrapping stops at terminal steps and at the end of the rollout.
+    """
+    T = rewards.shape[0]
+    returns = np.zeros(T, dtype=np.float32)
+    for t in range(T):
+        g = 0.0
+        discount = 1.0
+        idx = t
+        terminated = False
+        for k in range(n):
+            idx = t + k
+            if idx >= T:
+                idx = T - 1
+                break
+            g += discount * rewards[idx]
+            discount *= gamma
+            if dones[idx] > 0.0:
+                terminated = True
+                break
+        if not terminated:
+            g += discount * next_values[idx]
+        returns[t] = g
+    return returns
+
+
+def _precompile():
+    """Trigger JIT compilation at import so the first update isn't slowed by it."""
+    r = np.zeros(2, dtype=np.float32)
+    v = np.zeros(3, dtype=np.float32)
+    gae(r, v, r, 0.99, 0.95)
+    nstep_returns(r, v[:2], r, 0.99, 1)
+
+
+if NUMBA_AVAILABLE:
+    _precompile()
@@ -1,9 +1,52 @@
+import contextlib
+import json
 import torch
 from ..networks.policy import ValueNetwork, PolicyNetwork, QNetwork
 import numpy as np
 from src.utils.metrics import MetricsTracker
+from ._math import gae, nstep_returns
+
+# Checkpoint layout version: 2 stores tensors/state only; config lives in `<path>.config.json`
+CHECKPOINT_VERSION = 2
+
+# `network.inference_dtype` values accepted for autocast during action selection
+_INFERENCE_DTYPES = {"bf16": torch.bfloat16, "fp16": torch.float16}
+
+# `network.rollout_dtype` values: precision of the frozen copy used for training-time action selection
+_ROLLOUT_DTYPES = ("bf16", "int8")
+# `network.rollout_backend` values: "torchscript" traces the rollout copy's MLP trunk
+_ROLLOUT_BACKENDS = ("eager", "torchscript")
+
+def _stage_to_cpu(obj, stage, key=()):
+    """Copy every tensor in a nested state into reused CPU buffers in `stage` (keyed by path).
+
+    Device tensors land in pinned buffers via non_blocking copies; CPU tensors are
+    snapshotted too, since training keeps mutating them in place.
+    """
+    if isinstance(obj, torch.Tensor):
+        buf = stage.get(key)
+        if buf is None or buf.shape != obj.shape or buf.dtype != obj.dtype:
+            buf = torch.empty(obj.shape, dtype=obj.dtype, pin_memory=obj.is_cuda)
+            stage[key] = buf
+        buf.copy_(obj, non_blocking=obj.is_cuda)
+        return buf
+    if isinstance(obj, dict):
+        return {k: _stage_to_cpu(v, stage, key + (k,)) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_stage_to_cpu(v, stage, key + (i,)) for i, v in enumerate(obj))
+    return obj
+
+
 class BaseAgent:
     """Base class for all reinforcement learning agents."""
+
+    _autocast_dtype = None
+    # Set by _parse_configs; class defaults keep agents that override it (e.g. RandomAgent) valid
+    _rollout_dtype = None
+    _rollout_script = False
+    # Action selection runs under torch.inference_mode(); subclasses that need
+    # gradients through action selection (e.g. reparameterized policies) set False.
+    _inference_mode = True
     
     def __init__(self, env, config):
         """Initialize agent with environment and configuration."""
@@ -13,16 +56,30 @@ class BaseAgent:
         metrics_cfg = self.config.get("training", {}).get("metrics", {})
         self.metrics = MetricsTracker(window_size=metrics_cfg.get("window_size", 100))
      
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.obs_space = env.observation_space
-        self.action_space = env.action_space
+        # An explicit `device` skips the CUDA availability probe (and CUDA init)
+        device = self.config.get("device") or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = torch.device(device)
+        # Vector envs expose batched spaces; networks are sized from the per-env spaces
+        self.obs_space = getattr(env, "single_observation_space", env.observation_space)
+        self.action_space = getattr(env, "single_action_space", env.action_space)
+        self._discrete = hasattr(self.action_space, "n")
+        self._allocate_obs_buffers()
 
         self._parse_configs()
 
         self._create_networks()
+        self._rollout_net = None
+        self._updates = 0
+        self.sync_rollout_network()
 
         self._setup_optimizer()
 
+        # Gradient accumulation: optimizer steps once every `accumulation_steps` backward passes
+        self._accum = max(1, int(self.training_config.get("accumulation_steps", 1)))
+        self._micro = 0
+
+        self.set_mode(True)
+
     def _parse_configs(self):
         network_config = self.config.get("network", {})
         self.network_kwargs = {
@@ -33,19 +90,121 @@ class BaseAgent:
 
         self.network_config = network_config
         self.training_config = self.config.get("training", {})
+        self._io_sizes = self._resolve_io_sizes()
+
+        inference_dtype = network_config.get("inference_dtype")
+        if inference_dtype is not None and inference_dtype not in _INFERENCE_DTYPES:
+            raise ValueError(f"Unsupported inference_dtype: {inference_dtype}")
+        self._autocast_dtype = _INFERENCE_DTYPES.get(inference_dtype)
+
+        rollout_dtype = network_config.get("rollout_dtype")
+        if rollout_dtype is not None and rollout_dtype not in _ROLLOUT_DTYPES:
+            raise ValueError(f"Unsupported rollout_dtype: {rollout_dtype}")
+        if rollout_dtype == "int8" and self.device.type != "cpu":
+            raise ValueError("rollout_dtype 'int8' requires device 'cpu' (dynamic quantization is CPU-only)")
+        self._rollout_dtype = rollout_dtype
+        rollout_backend = network_config.get("rollout_backend") or "eager"
+        if rollout_backend not in _ROLLOUT_BACKENDS:
+            raise ValueError(f"Unsupported rollout_backend: {rollout_backend}")
+        self._rollout_script = rollout_backend == "torchscript"
+        self._rollout_sync = max(1, int(network_config.get("rollout_sync_interval", 1)))
+
+    def _resolve_io_sizes(self):
+        """Derive (input_size, output_size) as plain ints from the obs/action spaces."""
+        obs_shape = getattr(self.obs_space, 'shape', None)
+        if obs_shape:
+            input_size = int(obs_shape[0])
+        elif hasattr(self.obs_space, 'n'):
+            input_size = int(self.obs_space.n)
+        else:
+            raise ValueError(f"Unsupported obs space: {self.obs_space}")
+
+        if hasattr(self.action_space, 'n'):
+            # For Discrete action spaces
+            output_size = int(self.action_space.n)
+        elif getattr(self.action_space, 'shape', None):
+            output_size = int(self.action_space.shape[0])
+        else:
+            raise ValueError(f"Unsupported action space: {self.action_space}")
+        return input_size, output_size
         
-    def select_action(self, obs, training=True):
-        """Select an action given an observation."""
+    def set_mode(self, training: bool) -> None:
+        """Bind the training or evaluation action hook used by `select_action(s)`."""
+        self._act = self._select_action_training if training else self._select_action_evaluation
+
+    def select_action(self, obs, training=None):
+        """Select an action given an observation.
+
+        `training` overrides the mode bound by `set_mode` for this call only.
+        """
         obs = self._preprocess_obs(obs)
+        act = self._act if training is None else self._hook_for(training)
+        with torch.inference_mode(self._inference_mode), self._autocast():
+            action, info = act(obs)
+        return self._postprocess_action(action, info)
 
-        if training:
-            action, info = self._select_action_training(obs)
-        else:
-            action, info = self._select_action_evaluation(obs)
+    def select_actions(self, obs_batch, training=None):
+        """Select actions for a batch of observations from parallel environments."""
+        obs, scratch = self._preprocess_obs_batch(obs_batch)
+        try:
+            act = self._act if training is None else self._hook_for(training)
+            with torch.inference_mode(self._inference_mode), self._autocast():
+                action, info = act(obs)
+            return self._postprocess_action(action, info, batched=True)
+        finally:
+            for t in scratch:
+                self.release(t)
 
-        return action, info
+    @property
+    def _acting_network(self):
+        """Network that selects actions: `network` for single-net agents, else `policy_network`."""
+        if "type" in self.network_config:
+            return self.network
+        return self.policy_network
+
+    @property
+    def rollout_network(self):
+        """Network for training-time action selection (frozen copy if `rollout_dtype`/`rollout_backend` is set)."""
+        if self._rollout_net is not None:
+            return self._rollout_net
+        return self._acting_network
+
+    def sync_rollout_network(self):
+        """Rebuild the frozen rollout copy from the current fp32 weights."""
+        if self._rollout_dtype is None and not self._rollout_script:
+            return
+        # Trace against the static (1, obs_dim) device buffer used by select_action
+        example = self._obs_dev if self._rollout_script else None
+        self._rollout_net = self._acting_network.to_inference(self._rollout_dtype, example_obs=example)
+
+    def _hook_for(self, training):
+        return self._select_action_training if training else self._select_action_evaluation
+
+    def _autocast(self):
+        """Autocast context for the action forward pass; weights stay in fp32."""
+        if self._autocast_dtype is None:
+            return contextlib.nullcontext()
+        return torch.autocast(self.device.type, dtype=self._autocast_dtype)
+
+    def _allocate_obs_buffers(self):
+        """Preallocate a host staging tensor and a device tensor for single observations."""
+        shape = tuple(getattr(self.obs_space, "shape", None) or ())
+        pin = self.device.type == "cuda"
+        self._obs_host = torch.empty((1, *shape), dtype=torch.float32, pin_memory=pin)
+        self._obs_host_np = self._obs_host.numpy()
+        # On CPU the staging tensor already lives on the target device
+        self._obs_dev = torch.empty_like(self._obs_host, device=self.device) if pin else self._obs_host
+        # Side stream so host-to-device copies don't serialize behind the default stream
+        self._copy_stream = torch.cuda.Stream(device=self.device) if pin else None
+        # Scratch tensors keyed by (shape, dtype, device, pinned); see acquire/release
+        self._pool = {}
 
     def _preprocess_obs(self, obs):
+        if isinstance(obs, np.ndarray) and obs.shape == self._obs_host_np.shape[1:]:
+            np.copyto(self._obs_host_np[0], obs, casting="unsafe")
+            if self._obs_dev is not self._obs_host:
+                self._copy_to_device(self._obs_dev, self._obs_host)
+            return self._obs_dev
         if isinstance(obs, np.ndarray):
             obs = torch.from_numpy(obs).float()
         obs = obs.to(self.device)
@@ -53,9 +212,54 @@ class BaseAgent:
             obs = obs.unsqueeze(0)
         return obs
     
-    def _postprocess_action(self, action, info):
-        """Common action postprocessing."""
+    def _preprocess_obs_batch(self, obs_batch):
+        """Copy an (N, *obs_shape) batch into pooled staging/device buffers.
+
+        Returns the device tensor and the scratch tensors to release after use.
+        """
+        obs_batch = np.asarray(obs_batch)
+        pin = self.device.type == "cuda"
+        host = self.acquire(obs_batch.shape, device="cpu", pin_memory=pin)
+        np.copyto(host.numpy(), obs_batch, casting="unsafe")
+        if not pin:
+            return host, (host,)
+        dev = self.acquire(obs_batch.shape)
+        self._copy_to_device(dev, host)
+        return dev, (host, dev)
+
+    def acquire(self, shape, dtype=torch.float32, device=None, pin_memory=False):
+        """Check out a scratch tensor from the pool, allocating only on a miss."""
+        key = (tuple(shape), dtype, self._resolve_device(device), bool(pin_memory))
+        free = self._pool.get(key)
+        if free:
+            return free.pop()
+        return torch.empty(key[0], dtype=dtype, device=key[2], pin_memory=key[3])
+
+    def release(self, tensor):
+        """Return a tensor obtained from `acquire` to the pool."""
+        pinned = tensor.device.type == "cpu" and tensor.is_pinned()
+        key = (tuple(tensor.shape), tensor.dtype, tensor.device, pinned)
+        self._pool.setdefault(key, []).append(tensor)
+
+    def _resolve_device(self, device=None):
+        """Normalize a device so pool keys match `tensor.device` (explicit CUDA index)."""
+        device = torch.device(device) if device is not None else self.device
+        if device.type == "cuda" and device.index is None:
+            device = torch.device("cuda", torch.cuda.current_device())
+        return device
+
+    def _copy_to_device(self, dst, src):
+        """Copy pinned `src` into `dst` on the copy stream and order the compute stream after it."""
+        with torch.cuda.stream(self._copy_stream):
+            dst.copy_(src, non_blocking=True)
+        torch.cuda.current_stream(self.device).wait_stream(self._copy_stream)
+
+    def _postprocess_action(self, action, info, batched=False):
+        """Common action postprocessing; `batched` results always stay arrays."""
         if isinstance(action, torch.Tensor):
+            # Single Discrete action: one scalar sync, no numpy array round-trip
+            if self._discrete and not batched and action.numel() == 1:
+                return int(action.item()), info
             action = action.cpu().numpy()
         return action, info
 
@@ -72,22 +276,85 @@ class BaseAgent:
         """Update agent parameters using a batch of experience."""
         raise NotImplementedError("Subclass implements updates")
     
+    def _step_optimizer(self, loss):
+        """Backprop `loss` and step the optimizer every `accumulation_steps` calls.
+
+        Subclass updates call this instead of `loss.backward(); optimizer.step()`.
+        Returns True when the optimizer actually stepped.
+        """
+        (loss / self._accum).backward()
+        self._micro += 1
+        if self._micro % self._accum:
+            return False
+        self.optimizer.step()
+        self.optimizer.zero_grad(set_to_none=True)
+        self._updates += 1
+        if self._rollout_net is not None and self._updates % self._rollout_sync == 0:
+            self.sync_rollout_network()
+        return True
+
+    def _compute_returns(self, rewards, values, dones):
+        """GAE advantages and returns using `training.gamma`/`training.gae_lambda`."""
+        gamma = float(self.training_config.get("gamma", 0.99))
+        lam = float(self.training_config.get("gae_lambda", 0.95))
+        return gae(
+            np.ascontiguousarray(rewards, dtype=np.float32),
+            np.ascontiguousarray(values, dtype=np.float32),
+            np.ascontiguousarray(dones, dtype=np.float32),
+            gamma,
+            lam,
+        )
+
+    def _compute_nstep_returns(self, rewards, next_values, dones, n):
+        """n-step bootstrapped returns using `training.gamma`."""
+        gamma = float(self.training_config.get("gamma", 0.99))
+        return nstep_returns(
+            np.ascontiguousarray(rewards, dtype=np.float32),
+            np.ascontiguousarray(next_values, dtype=np.float32),
+            np.ascontiguousarray(dones, dtype=np.float32),
+            gamma,
+            int(n),
+        )
+
     def save(self, path):
         """Save agent model to specified path."""
-        save_dict = {
+        self.write_checkpoint(self.checkpoint_state(), path)
+
+    def checkpoint_state(self):
+        """Checkpoint payload; tensors still reference live (possibly device) storage."""
+        return {
+            '_VERSION': CHECKPOINT_VERSION,
             'network_state': self._get_network_state(),
             'optimizer_state': self.optimizer.state_dict(),
-            'config': self.config,
             'training_state': self._get_training_state()
         }
-        torch.save(save_dict, path)
+
+    def state_to_cpu(self, stage=None):
+        """Snapshot `checkpoint_state()` into CPU buffers, safe to write from another thread.
+
+        `stage` is a dict of staging buffers reused across calls; the returned state
+        aliases it, so it must not be reused until the previous write has finished.
+        """
+        state = _stage_to_cpu(self.checkpoint_state(), {} if stage is None else stage)
+        if self.device.type == "cuda":
+            # Only waits for the D2H copies just queued
+            torch.cuda.current_stream(self.device).synchronize()
+        return state
+
+    def write_checkpoint(self, state, path):
+        """Write a checkpoint payload (from `checkpoint_state`/`state_to_cpu`) to `path`."""
+        torch.save(state, path)
+        # Keep config out of the tensor file so it can be loaded with weights_only/mmap
+        with open(f"{path}.config.json", "w") as f:
+            json.dump(self.config, f, indent=2, default=str)
 
     def load(self, path):
         """Load agent model from specified path."""
-        checkpoint = torch.load(path, map_location=self.device)
+        checkpoint = torch.load(path, map_location=self.device, mmap=True, weights_only=True)
         self._load_network_state(checkpoint['network_state'])
         self.optimizer.load_state_dict(checkpoint['optimizer_state'])
         self._load_training_state(checkpoint['training_state'])
+        self.sync_rollout_network()
     
     def reset(self):
         """Reset agent to initial state."""
@@ -104,71 +371,64 @@ class BaseAgent:
     
     def _create_single_network(self):
         """Create single network (e.g., QNetwork for DQN/SARSA)."""
-        hidden_size = self.network_config.hidden_size
-        if hasattr(self.obs_space, 'shape'):
-            input_size = self.obs_space.shape[0]
-        elif hasattr(self.obs_space, 'n'):
-            input_size = self.obs_space.n
-        else:
-            raise ValueError(f"Unsupported obs space: {self.obs_space}")
-        
-        if hasattr(self.action_space, 'n'):
-            # For Discrete action spaces
-            output_size = self.action_space.n
-        elif hasattr(self.action_space, 'shape'):
-            output_size = self.action_space.shape[0]
-        else:
-            raise ValueError(f"Unsupported action space: {self.action_space}")
-        
-        if self.network_config.type == "QNetwork":
-            return QNetwork(input_size=input_size, hidden_size=hidden_size, num_actions=output_size)
-        elif self.network_config.type == "PolicyNetwork":
-            return PolicyNetwork(input_size=input_size, hidden_size=hidden_size, num_actions=output_size)
-        elif self.network_config.type == "ValueNetwork":
-            return ValueNetwork(input_size=input_size, hidden_size=hidden_size)
+        hidden_size = self.network_kwargs["hidden_size"]
+        input_size, output_size = self._io_sizes
+
+        net_type = self.network_config["type"]
+        if net_type == "QNetwork":
+            qnet = QNetwork(input_size=input_size, hidden_size=hidden_size, num_actions=output_size).to(self.device)
+            return self._maybe_compile(qnet)
+        elif net_type == "PolicyNetwork":
+            return PolicyNetwork(
+                input_size=input_size, hidden_size=hidden_size, num_actions=output_size, compile=self._compile_mlp
+            ).to(self.device)
+        elif net_type == "ValueNetwork":
+            return ValueNetwork(input_size=input_size, hidden_size=hidden_size, compile=self._compile_mlp).to(self.device)
         else:
-            raise ValueError(f"Unsupported Network type: {self.network_config.type}")
+            raise ValueError(f"Unsupported Network type: {net_type}")
     
+    def _maybe_compile(self, network):
+        """Compile the network's greedy action path when `network.compile` is enabled."""
+        if not self.network_config.get("compile", False):
+            return network
+        # Compile the bound method rather than the module so state_dict keys stay unprefixed.
+        # Observations arrive as a fixed (1, obs_dim) buffer, so shapes are static.
+        network.get_action = torch.compile(
+            network.get_action, mode="reduce-overhead", fullgraph=True, dynamic=False
+        )
+        return network
+
+    @property
+    def _compile_mlp(self):
+        """Whether policy/value MLP trunks are torch.compile'd (`network.compile_policy`)."""
+        return bool(self.network_config.get("compile_policy", False))
+
     def _create_dual_networks(self):
         """Create dual networks (e.g., PolicyNetwork and ValueNetwork for PPO)."""
-        hidden_size = self.network_config.hidden_size
-        if hasattr(self.obs_space, 'shape'):
-            input_size = self.obs_space.shape[0]
-        elif hasattr(self.obs_space, 'n'):
-            input_size = self.obs_space.n
-        else:
-            raise ValueError(f"Unsupported obs space: {self.obs_space}")
-        
-        if hasattr(self.action_space, 'n'):
-            # For Discrete action spaces
-            output_size = self.action_space.n
-        elif hasattr(self.action_space, 'shape'):
-            output_size = self.action_space.shape[0]
-        else:
-            raise ValueError(f"Unsupported action space: {self.action_space}")
-        
+        hidden_size = self.network_kwargs["hidden_size"]
+        input_size, output_size = self._io_sizes
+
         if self.network_config.get("policy_type") == "PolicyNetwork":
-            polnet = PolicyNetwork(input_size=input_size, hidden_size=hidden_size, num_actions=output_size)
+            polnet = PolicyNetwork(
+                input_size=input_size, hidden_size=hidden_size, num_actions=output_size, compile=self._compile_mlp
+            )
         else:
             raise ValueError(f"Unsupported policy type: {self.network_config.get('policy_type')}")
         if self.network_config.get("value_type") == "ValueNetwork":
-            valnet = ValueNetwork(input_size=input_size, hidden_size=hidden_size)
+            valnet = ValueNetwork(input_size=input_size, hidden_size=hidden_size, compile=self._compile_mlp)
         else:
             raise ValueError(f"Unsupported value type: {self.network_config.get('value_type')}")
-        return polnet, valnet
+        return polnet.to(self.device), valnet.to(self.device)
 
     def _setup_optimizer(self):
         """Setup the optimizer with learning rate and weight decay."""
         opt_name = self.network_config.get("optimizer", "Adam")
         lr = self.network_kwargs.get("learning_rate", 0.001)
         wd = self.network_kwargs.get("weight_decay", 0.0)
-    # make sure networks exist and are on device
+        # networks are already on device (placed by _create_networks)
         if "type" in self.network_config:  # single net
-            self.network.to(self.device)
             params = self.network.parameters()
         else:  # dual nets
-            self.policy_network.to(self.device)
-            self.value_network.to(self.device)
             params = list(self.policy_network.parameters()) + list(self.value_network.parameters())
 
         self.optimizer = getattr(torch.optim, opt_name)(params, lr=lr, weight_decay=wd)
@@ -190,13 +450,13 @@ class BaseAgent:
         m = self.metrics
         return {
             "metrics": {
-                "window_size": m.rewards.maxlen,
+                "window_size": m.window_size,
                 "total_episodes": m.total_episodes,
                 "total_steps": m.total_steps,
                 "total_reward": m.total_reward,
-                "reward_window": list(m.rewards),
-                "length_window": list(m.lengths),
-                "loss_window": list(m.losses)
+                "reward_window": m.rewards.tobytes(),
+                "length_window": m.lengths.tobytes(),
+                "loss_window": m.losses.tobytes()
             }
         }
     
@@ -208,23 +468,17 @@ class BaseAgent:
         """
         if "type" in self.network_config:
             self.network.load_state_dict(network_state)
-            self.network.to(self.device)
         else:
             self.policy_network.load_state_dict(network_state["policy"])
             self.value_network.load_state_dict(network_state["value"])
-            self.policy_network.to(self.device)
-            self.value_network.to(self.device)
     
     def _load_training_state(self, training_state):
         """Load training state from checkpoint. Subclass may override"""
         m_state = training_state.get("metrics", {})
         self.metrics = MetricsTracker(window_size=m_state.get("window_size", 100))
-        for r in m_state.get("reward_window", []):
-            self.metrics.rewards.append(r)
-        for l in m_state.get("length_window", []):
-            self.metrics.lengths.append(l)
-        for x in m_state.get("loss_window", []):
-            self.metrics.losses.append(x)
+        self.metrics.rewards.load(m_state.get("reward_window", []))
+        self.metrics.lengths.load(m_state.get("length_window", []))
+        self.metrics.losses.load(m_state.get("loss_window", []))
         self.metrics.total_episodes = m_state.get("total_episodes", 0)
         self.metrics.total_steps = m_state.get("total_steps", 0)
         self.metrics.total_reward = m_state.get("total_reward", 0)
@@ -1,10 +1,15 @@
+import importlib
 from typing import Any, Mapping
 
-from .random import RandomAgent
-from .dqn import DQNAgent
-from .ppo import PPOAgent
-from .sarsa import SARSAAgent
-from .grpo import GRPOAgent
+# algorithm.type (lower-cased) -> (module within src.agents, class name).
+# Modules are imported on first use so a run only pays for the agent it builds.
+_AGENT_REGISTRY = {
+    "random": ("random", "RandomAgent"),
+    "dqn": ("dqn", "DQNAgent"),
+    "sarsa": ("sarsa", "SARSAAgent"),
+    "ppo": ("ppo", "PPOAgent"),
+    "grpo": ("grpo", "GRPOAgent"),
+}
 
 def build_agent(env: Any, config: Mapping[str, Any]) -> Any:
     """Construct and return an agent instance suitable for `env`.
@@ -14,15 +19,9 @@ def build_agent(env: Any, config: Mapping[str, Any]) -> Any:
     any relevant hyperparameters, and return the initialized agent.
     """
     
-    agent_type = config['algorithm']['type']
-    return RandomAgent(env, config)
-    # if agent_type == "random":
-    #     return RandomAgent(env, config)
-    # elif agent_type == "dqn":
-    #     return DQNAgent(env, config)
-    # elif agent_type == "ppo":
-    #     return PPOAgent(env, config)
-    # elif agent_type == "grpo":
-    #     return GRPOAgent(env, config)
-    # else:
-    #     raise ValueError(f"Invalid agent type: {agent_type}")
\ No newline at end of file
+    agent_type = str(config['algorithm']['type']).lower()
+    if agent_type not in _AGENT_REGISTRY:
+        raise ValueError(f"Invalid agent type: {agent_type}")
+    module_name, class_name = _AGENT_REGISTRY[agent_type]
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, class_name)(env, config)
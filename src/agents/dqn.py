@@ -1,11 +1,43 @@
+import torch
 from .base import BaseAgent
 
 class DQNAgent(BaseAgent):
     def __init__(self, env, config):
         super().__init__(env, config)
+        # Greedy evaluation is replayed from a captured CUDA graph (see _capture_action_graph)
+        self._action_graph = None
+        self._graph_action = None
 
     def _select_action_training(self, obs):
-        return self.network.get_action(obs)
-    
+        return self.rollout_network.get_action(obs), {}
+
     def _select_action_evaluation(self, obs):
-        return self.network.get_action(obs)
\ No newline at end of file
+        if not self._can_use_action_graph(obs):
+            return self.network.get_action(obs), {}
+        if self._action_graph is None:
+            self._capture_action_graph()
+        self._action_graph.replay()
+        # The graph output buffer is overwritten on every replay
+        return self._graph_action.clone(), {}
+
+    def _can_use_action_graph(self, obs):
+        """Graphs need CUDA and the fixed staging buffer; compiled nets already use graphs."""
+        return (
+            self.device.type == "cuda"
+            and obs is self._obs_dev
+            and not self.network_config.get("compile", False)
+        )
+
+    def _capture_action_graph(self):
+        """Capture forward + argmax over the static observation buffer."""
+        stream = torch.cuda.Stream(device=self.device)
+        stream.wait_stream(torch.cuda.current_stream(self.device))
+        with torch.cuda.stream(stream):
+            # Warm up so lazy cuBLAS/allocator init happens outside the capture
+            for _ in range(3):
+                self.network.get_action(self._obs_dev)
+        torch.cuda.current_stream(self.device).wait_stream(stream)
+
+        self._action_graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._action_graph):
+            self._graph_action = self.network.get_action(self._obs_dev)
@@ -5,7 +5,9 @@ class PPOAgent(BaseAgent):
         super().__init__(env, config)
 
     def _select_action_training(self, obs):
-        return self.network.get_action(obs)
+        action, log_prob = self.rollout_network.get_action(obs)
+        return action, {"log_prob": log_prob}
     
     def _select_action_evaluation(self, obs):
-        return self.network.get_action(obs)
\ No newline at end of file
+        action, log_prob = self._acting_network.get_action(obs, deterministic=True)
+        return action, {"log_prob": log_prob}
@@ -17,6 +17,10 @@ class RandomAgent(BaseAgent):
     def __init__(self, env: Any, config: Optional[Mapping[str, Any]] = None) -> None:
         self.env = env
         self.config = dict(config or {})
+        # No networks to run, so never probe or initialize CUDA
+        # (defaults.yaml sets `device: null`, so an unset device is falsy rather than missing)
+        if not self.config.get("device"):
+            self.config["device"] = "cpu"
         super().__init__(env, self.config)
 
     # ---- BaseAgent lifecycle overrides (disable networks/optimizers) ----
@@ -43,18 +47,21 @@ class RandomAgent(BaseAgent):
         return action, {"policy": "random", "mode": "evaluation"}
 
     # ---- Persistence (optional minimal stubs) ----
-    def save(self, path: Any) -> None:  # type: ignore[override]
-        """Save minimal agent metadata for consistency with Trainer APIs."""
-        payload = {
+    def checkpoint_state(self) -> Dict[str, Any]:  # type: ignore[override]
+        """Minimal agent metadata for consistency with Trainer APIs."""
+        return {
             "agent_type": "RandomAgent",
             "config": self.config,
         }
-        torch.save(payload, path)
+
+    def write_checkpoint(self, state: Dict[str, Any], path: Any) -> None:  # type: ignore[override]
+        """Save the metadata payload; there are no tensors or config sidecar."""
+        torch.save(state, path)
 
     def load(self, path: Any) -> None:  # type: ignore[override]
         """Load minimal agent metadata saved by `save`. No weights to restore."""
         try:
-            payload = torch.load(path, map_location="cpu")
+            payload = torch.load(path, map_location="cpu", weights_only=True)
             if isinstance(payload, dict) and "config" in payload:
                 self.config = payload["config"]
         except Exception:
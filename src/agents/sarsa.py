@@ -5,7 +5,7 @@ class SARSAAgent(BaseAgent):
         super().__init__(env, config)
 
     def _select_action_training(self, obs):
-        return self.network.get_action(obs)
+        return self.rollout_network.get_action(obs), {}
     
     def _select_action_evaluation(self, obs):
-        return self.network.get_action(obs)
\ No newline at end of file
+        return self.network.get_action(obs), {}
\ No newline at end of file
@@ -1 +1,7 @@
-# Environment wrappers package 
\ No newline at end of file
+from .base import BaseWrapper
+from .normalize_obs import NormalizeObservations
+from .normalize_rewards import NormalizeRewards
+from .frame_stack import FrameStack
+from .env_factory import EnvironmentFactory
+
+__all__ = ["BaseWrapper", "NormalizeObservations", "NormalizeRewards", "FrameStack", "EnvironmentFactory"]
@@ -0,0 +1,133 @@
+"""Per-step kernels for the normalization wrappers.
+
+With Numba installed these are explicit JIT-compiled loops that update stats
+in place and write the normalized observation without numpy temporaries.
+Without Numba the equivalent numpy expressions are used instead, since
+interpreted element loops would be far slower than vectorized numpy.
+"""
+
+import numpy as np
+
+from src.utils.jit import njit, prange, NUMBA_AVAILABLE
+
+# Above this many features the fused obs kernel runs its loop in parallel
+PARALLEL_MIN_SIZE = 1024
+
+
+@njit(cache=True, fastmath=True)
+def _normalize_jit(obs, mean, inv_std, out):
+    """Write (obs - mean) * inv_std into the float32 array `out` and return it."""
+    o = out.reshape(out.size)
+    x = obs.reshape(obs.size)
+    m = mean.reshape(mean.size)
+    s = inv_std.reshape(inv_std.size)
+    for i in range(o.shape[0]):
+        o[i] = (x[i] - m[i]) * s[i]
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _welford_normalize_jit(mean, m2, obs, count, eps):
+    """Fused Welford update + normalize in one pass; returns a new float32 array."""
+    out = np.empty(obs.shape, dtype=np.float32)
+    o = out.reshape(out.size)
+    m = mean.reshape(mean.size)
+    q = m2.reshape(m2.size)
+    x = obs.reshape(obs.size)
+    for i in range(o.shape[0]):
+        d = x[i] - m[i]
+        m[i] += d / count
+        q[i] += d * (x[i] - m[i])
+        s = np.sqrt(q[i] / (count - 1)) if count > 1 else 1.0
+        o[i] = (x[i] - m[i]) / (s + eps)
+    return out
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _welford_normalize_par_jit(mean, m2, obs, count, eps):
+    """`_welford_normalize_jit` with a parallel loop, for wide observations."""
+    out = np.empty(obs.shape, dtype=np.float32)
+    o = out.reshape(out.size)
+    m = mean.reshape(mean.size)
+    q = m2.reshape(m2.size)
+    x = obs.reshape(obs.size)
+    for i in prange(o.shape[0]):
+        d = x[i] - m[i]
+        m[i] += d / count
+        q[i] += d * (x[i] - m[i])
+        s = np.sqrt(q[i] / (count - 1)) if count > 1 else 1.0
+        o[i] = (x[i] - m[i]) / (s + eps)
+    return out
+
+
+@njit(cache=True)
+def welford_scalar(mean, m2, x, count, eps):
+    """Scalar Welford update + normalize; returns (mean, m2, normalized x)."""
+    d = x - mean
+    mean += d / count
+    m2 += d * (x - mean)
+    s = np.sqrt(m2 / (count - 1)) if count > 1 else 1.0
+    return mean, m2, (x - mean) / (s + eps)
+
+
+def _welford_update_np(mean, m2, obs, count, delta, delta2):
+    np.subtract(obs, mean, out=delta)
+    np.divide(delta, count, out=delta2)
+    mean += delta2
+    np.subtract(obs, mean, out=delta2)
+    delta *= delta2
+    m2 += delta
+
+
+def _normalize_np(obs, mean, inv_std, out):
+    np.subtract(obs, mean, out=out)
+    np.multiply(out, inv_std, out=out)
+    return out
+
+
+def _welford_normalize_np(mean, m2, obs, count, eps, delta, delta2):
+    _welford_update_np(mean, m2, obs, count, delta, delta2)
+    # Reuse `delta` for 1 / (std + eps) so the only allocation is the returned array
+    if count > 1:
+        np.divide(m2, count - 1, out=delta)
+        np.sqrt(delta, out=delta)
+        delta += eps
+        np.reciprocal(delta, out=delta)
+    else:
+        delta.fill(1.0 / (1.0 + eps))
+    return _normalize_np(obs, mean, delta, np.empty(obs.shape, dtype=np.float32))
+
+
+def _welford_normalize_dispatch(mean, m2, obs, count, eps, delta, delta2):
+    # The loops need no scratch; `delta`/`delta2` only exist for the numpy fallback's signature
+    if obs.size > PARALLEL_MIN_SIZE:
+        return _welford_normalize_par_jit(mean, m2, obs, count, eps)
+    return _welford_normalize_jit(mean, m2, obs, count, eps)
+
+
+if NUMBA_AVAILABLE:
+    normalize = _normalize_jit
+    welford_normalize = _welford_normalize_dispatch
+else:
+    normalize = _normalize_np
+    welford_normalize = _welford_normalize_np
+
+
+def _precompile():
+    """Compile the common 1-D float32/float64 signatures at import time.
+
+    The parallel kernel is left to compile on first use (and is disk-cached),
+    since most observation spaces never reach PARALLEL_MIN_SIZE.
+    """
+    mean = np.zeros(1, dtype=np.float64)
+    m2 = np.zeros(1, dtype=np.float64)
+    std = np.ones(1, dtype=np.float32)
+    for dtype in (np.float32, np.float64):
+        obs = np.zeros(1, dtype=dtype)
+        normalize(obs, mean, std, np.empty(1, dtype=np.float32))
+        _welford_normalize_jit(mean, m2, obs, 1, 1e-8)
+    welford_scalar(0.0, 0.0, 0.0, 1, 1e-8)
+
+
+if NUMBA_AVAILABLE:
+    _precompile()
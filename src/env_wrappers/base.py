@@ -1,30 +1,39 @@
-class BaseWrapper:
-    def __init__(self, env, config, **kwargs):
-        self.env = env
+import gymnasium as gym
+
+
+class BaseWrapper(gym.Wrapper):
+    """Config-aware wrapper; reset/render/close and space/spec/metadata
+    forwarding are inherited from `gym.Wrapper`."""
+
+    def __init__(self, env, config=None, **kwargs):
+        super().__init__(env)
         self.config = config or {}
-        self.kwargs = kwargs
-        
-    def reset(self, **kwargs):
-        """Reset the environment and return initial observation."""
-        return self.env.reset(**kwargs)
-    
-    def step(self, action, **kwargs):
-        """Take a step in the environment with the given action."""
-        return self.env.step(action, **kwargs)
-    
-    def render(self, **kwargs):
-        """Render the environment state."""
-        return self.env.render(**kwargs)
-    
-    def close(self):
-        """Close the environment and free resources."""
-        self.env.close()
-    
+
+    def step(self, action):
+        """Step the inner env and apply this wrapper's per-step transform."""
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        obs, reward = self._transform_step(obs, reward)
+        return obs, reward, terminated, truncated, info
+
+    def _transform_step(self, obs, reward):
+        """Map a step's (obs, reward); subclasses override instead of `step`."""
+        return obs, reward
+
+    def set_chain_training(self, training):
+        """Set training mode on every wrapper in this chain (reachable via `VectorEnv.call`)."""
+        from src.utils.eval import set_env_training_mode
+        set_env_training_mode(self, training)
+
+    def flush_chain_stats(self):
+        """Flush deferred running-stat updates in this chain (reachable via `VectorEnv.call`)."""
+        from src.utils.eval import flush_env_stats
+        flush_env_stats(self)
+
     def seed(self, seed=None):
         """Set the random seed for reproducible behavior."""
         if seed is None:
             return
-        
+
         if hasattr(self.env, "action_space") and hasattr(self.env.action_space, "seed"):
             self.env.action_space.seed(seed)
         if hasattr(self.env, "observation_space") and hasattr(self.env.observation_space, "seed"):
@@ -36,28 +45,3 @@ class BaseWrapper:
             self.env.reset(seed=seed)
         except Exception:
             pass
-    
-    @property
-    def observation_space(self):
-        """Get the observation space of the environment."""
-        return self.env.observation_space
-    
-    @property
-    def action_space(self):
-        """Get the action space of the environment."""
-        return self.env.action_space
-    
-    @property
-    def spec(self):
-        """Get the environment specification."""
-        return self.env.spec
-    
-    @property
-    def unwrapped(self):
-        """Get the unwrapped environment."""
-        return self.env
-    
-    @property
-    def metadata(self):
-        """Get the environment metadata."""
-        return self.env.metadata
\ No newline at end of file
@@ -1,3 +1,5 @@
+import functools
+import json
 from .base import BaseWrapper
 import gymnasium as gym
 from .frame_stack import FrameStack
@@ -11,6 +13,14 @@ WRAPPER_REGISTRY = {
     "normalize_rewards": NormalizeRewards,
 }
 
+WRAPPER_NAMES = frozenset(WRAPPER_REGISTRY)
+
+# `environment.vector_mode`: how sub-envs run when `num_envs > 1`
+VECTOR_ENV_CLASSES = {
+    "sync": gym.vector.SyncVectorEnv,
+    "async": gym.vector.AsyncVectorEnv,
+}
+
 # Canonical default order: observation transforms → temporal transforms → reward transforms
 DEFAULT_WRAPPER_ORDER = [
     "normalize_observations",
@@ -18,9 +28,29 @@ DEFAULT_WRAPPER_ORDER = [
     "normalize_rewards",
 ]
 
+def _composed_step(base_step, fns, action):
+    """Step the base env and apply `fns` to its (obs, reward)."""
+    obs, reward, terminated, truncated, info = base_step(action)
+    for fn in fns:
+        obs, reward = fn(obs, reward)
+    return obs, reward, terminated, truncated, info
+
+
+def _make_composed_step(base_step, fns):
+    """Bind `_composed_step` to a chain.
+
+    A partial of bound methods (unlike a closure) survives `copy.deepcopy`, so a
+    copied env steps its own wrappers rather than the original's.
+    """
+    return functools.partial(_composed_step, base_step, fns)
+
+
 class EnvironmentFactory:
-    def create_env(self, env_name, config, **kwargs):
-        """Main method to create and configure environment."""
+    def create_env(self, env_name, config, vector_mode=None, **kwargs):
+        """Main method to create and configure environment.
+
+        `vector_mode` ("sync" | "async") overrides `environment.vector_mode` for `num_envs > 1`.
+        """
         self._validate_config(config, env_name)
         env_kwargs = {}
         env_cfg = (config or {}).get("environment", {})
@@ -28,12 +58,30 @@ class EnvironmentFactory:
         if env_cfg.get("render_mode") is not None:
             env_kwargs["render_mode"] = env_cfg["render_mode"]
 
-        env = self._create_base_env(env_name, **{**env_kwargs, **kwargs})
-        env = self.apply_wrappers(env, self._get_wrapper_config(config))
-        return env
+        env_kwargs = {**env_kwargs, **kwargs}
+        wrapper_config = self._get_wrapper_config(config)
+
+        num_envs = int(env_cfg.get("num_envs", 1))
+        if num_envs > 1:
+            # Each sub-env gets its own wrapper chain so running statistics stay per-env
+            mode = vector_mode or env_cfg.get("vector_mode") or "sync"
+            if mode not in VECTOR_ENV_CLASSES:
+                raise ValueError(f"Unsupported vector_mode: {mode}")
+            return VECTOR_ENV_CLASSES[mode](
+                [lambda: self._create_wrapped_env(env_name, wrapper_config, **env_kwargs)] * num_envs
+            )
+        return self._create_wrapped_env(env_name, wrapper_config, **env_kwargs)
+
+    def _create_wrapped_env(self, env_name, wrapper_config, **kwargs):
+        """Create a single base environment and apply the wrapper chain."""
+        env = self._create_base_env(env_name, **kwargs)
+        return self.apply_wrappers(env, wrapper_config)
 
     def apply_wrappers(self, env, wrapper_config, **kwargs):
         """Apply wrapper chain to environment in a deterministic order."""
+        if not self._any_wrapper_enabled(wrapper_config):
+            return env
+
         current_env = env
 
         # Resolve explicit order from config or fall back to canonical default
@@ -44,7 +92,7 @@ class EnvironmentFactory:
             params = wrapper_config.get(wrapper_name, {}) if isinstance(wrapper_config, dict) else {}
             if not params or not params.get("enabled", False):
                 continue
-            if wrapper_name not in WRAPPER_REGISTRY:
+            if wrapper_name not in WRAPPER_NAMES:
                 continue
             wrapper_class = WRAPPER_REGISTRY[wrapper_name]
             current_env = wrapper_class(current_env, params)
@@ -60,10 +108,38 @@ class EnvironmentFactory:
                 params = wrapper_config.get(name, {})
                 if not params or not params.get("enabled", False):
                     continue
-                if name in WRAPPER_REGISTRY:
+                if name in WRAPPER_NAMES:
                     current_env = WRAPPER_REGISTRY[name](current_env, params)
 
-        return current_env
+        return self._compose(current_env)
+
+    def _compose(self, env):
+        """Collapse the BaseWrapper chain's step() into one frame on the outermost wrapper.
+
+        reset() and attribute access still go through each wrapper; only the per-step
+        path is flattened. Wrappers keep their own state, so behavior is unchanged.
+        """
+        chain = []
+        inner = env
+        while isinstance(inner, BaseWrapper):
+            chain.append(inner)
+            inner = inner.env
+        if len(chain) < 2:
+            return env
+        # Transforms run innermost-first, matching nested step() calls
+        fns = tuple(w._transform_step for w in reversed(chain))
+        env.step = _make_composed_step(inner.step, fns)
+        return env
+
+    def _any_wrapper_enabled(self, wrapper_config):
+        """Return True if at least one wrapper in the config is enabled."""
+        if not isinstance(wrapper_config, dict):
+            return False
+        return any(
+            isinstance(params, dict) and params.get("enabled", False)
+            for name, params in wrapper_config.items()
+            if name != "order"
+        )
 
     def _create_base_env(self, env_name, **kwargs):
         """Create the base environment without wrappers."""
@@ -82,17 +158,29 @@ class EnvironmentFactory:
             order = wrapper_config.get("order")
             if isinstance(order, list):
                 # Only keep names that are known wrappers to avoid typos breaking flow
-                return [name for name in order if name in WRAPPER_REGISTRY]
+                return [name for name in order if name in WRAPPER_NAMES]
         return list(DEFAULT_WRAPPER_ORDER)
 
     def _validate_config(self, config, env_name=None):
         """Validate that config has required fields."""
+        # Only the environment section is validated, so it alone forms the cache key
+        env_section = {"environment": config["environment"]} if "environment" in config else {}
+        cfg_key = json.dumps(env_section, sort_keys=True, default=str)
+        errors = self._validate_cached(env_name, cfg_key)
+        if errors:
+            raise ValueError(f"Config validation failed:\n" + "\n".join(f"- {error}" for error in errors))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _validate_cached(env_name, cfg_key):
+        """Return validation errors for (env_name, serialized env section) as a tuple."""
+        config = json.loads(cfg_key)
         errors = []
 
-        # Validate environment name
+        # Validate environment name against the registry without constructing the env
         if env_name:
             try:
-                gym.make(env_name)
+                gym.spec(env_name)
             except Exception as e:
                 errors.append(f"Environment '{env_name}' not found: {e}")
         
@@ -106,22 +194,28 @@ class EnvironmentFactory:
             if not env_name and "env_name" not in env_config:
                 errors.append("Missing 'env_name' in environment config")
 
+            num_envs = env_config.get("num_envs", 1)
+            if not isinstance(num_envs, int) or num_envs < 1:
+                errors.append("Invalid 'environment.num_envs' (int >= 1 required)")
+            if (env_config.get("vector_mode") or "sync") not in VECTOR_ENV_CLASSES:
+                errors.append("Invalid 'environment.vector_mode' (\"sync\" or \"async\" required)")
+
         # Validate wrappers
-        wrapper_config = self._get_wrapper_config(config)
+        wrapper_config = config.get("environment", {}).get("wrappers", {})
         if isinstance(wrapper_config, dict):
             # Validate explicit order list if present
             if "order" in wrapper_config and not isinstance(wrapper_config["order"], list):
                 errors.append("'environment.wrappers.order' must be a list if provided")
             if isinstance(wrapper_config.get("order"), list):
                 for name in wrapper_config["order"]:
-                    if name not in WRAPPER_REGISTRY:
+                    if name not in WRAPPER_NAMES:
                         errors.append(f"Unknown wrapper in order: {name}")
 
             # Validate wrapper names (excluding the special 'order' key)
             for wrapper_name in wrapper_config:
                 if wrapper_name == "order":
                     continue
-                if wrapper_name not in WRAPPER_REGISTRY:
+                if wrapper_name not in WRAPPER_NAMES:
                     errors.append(f"Unknown wrapper: {wrapper_name}")
             
             for name, params in wrapper_config.items():
@@ -131,20 +225,23 @@ class EnvironmentFactory:
                     v = params.get("frame_stack", None)
                     if v is None or not isinstance(v, int) or v < 1:
                         errors.append("Invalid 'environment.wrappers.frame_stack.frame_stack' (int >= 1 required)")
+                    if "copy_obs" in params and not isinstance(params["copy_obs"], bool):
+                        errors.append("Invalid 'environment.wrappers.frame_stack.copy_obs' (bool required)")
                 if name == "normalize_observations":
                     if "epsilon" in params and not isinstance(params["epsilon"], (int, float)):
                         errors.append("Invalid 'environment.wrappers.normalize_observations.epsilon' (number required)")
-                    if "momentum" in params and not isinstance(params["momentum"], (int, float)):
-                        errors.append("Invalid 'environment.wrappers.normalize_observations.momentum' (number required)")
+                    if "momentum" in params:
+                        # Stats are exact running moments now; an EMA setting would be silently ignored
+                        errors.append("'environment.wrappers.normalize_observations.momentum' is no longer supported (remove it)")
                     if "reset_stats_on_episode" in params and not isinstance(params["reset_stats_on_episode"], bool):
                         errors.append("Invalid 'environment.wrappers.normalize_observations.reset_stats_on_episode' (bool required)")
+                    if "deferred_stats" in params and not isinstance(params["deferred_stats"], bool):
+                        errors.append("Invalid 'environment.wrappers.normalize_observations.deferred_stats' (bool required)")
                 if name == "normalize_rewards":
                     if "epsilon" in params and not isinstance(params["epsilon"], (int, float)):
                         errors.append("Invalid 'environment.wrappers.normalize_rewards.epsilon' (number required)")
 
-        
-        if errors:
-            raise ValueError(f"Config validation failed:\n" + "\n".join(f"- {error}" for error in errors))
+        return tuple(errors)
 
     def get_available_environments(self):
         """Return list of supported environment names."""
@@ -1,6 +1,5 @@
 from .base import BaseWrapper
 import numpy as np
-from collections import deque
 from gymnasium.spaces import Box
 
 class FrameStack(BaseWrapper):
@@ -10,30 +9,38 @@ class FrameStack(BaseWrapper):
         """Initialize with frame stacking configuration."""
         super().__init__(env, config)
         self.num_frames = config.get('frame_stack', 1)
-        self.frames = deque(maxlen=self.num_frames)
+        # False: return a reused output array (valid until the next step/reset) instead of a fresh copy
+        self.copy_obs = bool(config.get('copy_obs', True))
+        # Circular frame buffer sized from the inner observation space, and rebuilt on
+        # reset if the observations actually returned differ from it (e.g. upcast by a wrapper).
+        # `_head` is the slot of the oldest frame, which is also the next one overwritten.
+        inner = self.env.observation_space
+        self._allocate(inner.shape, inner.dtype)
+        # Oldest-to-newest slot order for each possible head position
+        base = np.arange(self.num_frames)
+        self._orders = [np.roll(base, -h) for h in range(self.num_frames)]
+        # Stacked Box, built once on first access (the inner space is fixed)
+        self._stacked_space = None
         
     @property
     def observation_space(self):
         """Get modified observation space for stacked frames."""
         if self.num_frames == 1:
             return self.env.observation_space
-        
-        original_space = self.env.observation_space
-        original_shape = original_space.shape
-        new_shape = (self.num_frames,) + original_shape
-
-        original_low = self.env.observation_space.low
-        original_high = self.env.observation_space.high
+        if self._stacked_space is None:
+            self._stacked_space = self._build_stacked_space(self.env.observation_space)
+        return self._stacked_space
 
-
-        new_low = np.broadcast_to(original_low, new_shape)
-        new_high = np.broadcast_to(original_high, new_shape)
-        new_dtype = self.env.observation_space.dtype
+    def _build_stacked_space(self, original_space):
+        """Box over (num_frames, *obs_shape); bounds are broadcast views, not tiled copies."""
+        new_shape = (self.num_frames,) + original_space.shape
+        new_low = np.broadcast_to(original_space.low[np.newaxis, ...], new_shape)
+        new_high = np.broadcast_to(original_space.high[np.newaxis, ...], new_shape)
 
         return Box(
             low=new_low,
             high=new_high,
-            dtype=new_dtype,
+            dtype=original_space.dtype,
             shape=new_shape
         )
 
@@ -41,40 +48,49 @@ class FrameStack(BaseWrapper):
     def reset(self, **kwargs):
         """Reset environment and initialize frame stack."""
         obs, info = self.env.reset(**kwargs)
-        self.frames.clear()
         self._initialize_frames(obs)
         return self._get_stacked_obs(), info
     
-    def step(self, action, **kwargs):
-        """Take step and update frame stack."""
-        obs, reward, terminated, truncated, info = self.env.step(action, **kwargs)
-
+    def _transform_step(self, obs, reward):
+        """Update frame stack with the new observation."""
         self._update_frames(obs)
-        
-        return self._get_stacked_obs(), reward, terminated, truncated, info
+        return self._get_stacked_obs(), reward
     
     def _get_stacked_obs(self):
-        """Get current stacked observation from frame buffer."""
-        if len(self.frames) < self.num_frames:
-            while len(self.frames) < self.num_frames:
-                self.frames.append(self.frames[-1].copy())
-        
-        return np.array(list(self.frames))
+        """Get current stacked observation (oldest frame first) from frame buffer.
+
+        Gathers into a fresh array so callers can keep the result across steps,
+        unless `copy_obs` is off, in which case the preallocated output is reused.
+        """
+        order = self._orders[self._head]
+        if self.copy_obs:
+            return np.take(self._buf, order, axis=0)
+        # mode="clip" lets take write straight into `out` (mode="raise" buffers it); indices are always valid
+        return np.take(self._buf, order, axis=0, out=self._stack_out, mode="clip")
     
+    def _allocate(self, shape, dtype):
+        self._buf = np.empty((self.num_frames,) + tuple(shape), dtype=dtype)
+        self._stack_out = np.empty_like(self._buf)
+        self._head = 0
+
     def _initialize_frames(self, obs):
-        """Initialize frame buffer with first observation."""
-        self.frames.clear()
-        for _ in range(self.num_frames):
-            self.frames.append(obs.copy())
+        """Fill every slot with the first observation (one broadcast write)."""
+        obs = np.asarray(obs)
+        if obs.dtype != self._buf.dtype or obs.shape != self._buf.shape[1:]:
+            self._allocate(obs.shape, obs.dtype)
+        self._buf[:] = obs[np.newaxis, ...]
+        self._head = 0
     
     def _update_frames(self, obs):
-        """Update frame buffer with new observation."""
-        self.frames.append(obs.copy())
+        """Overwrite the oldest slot with the new observation."""
+        self._buf[self._head] = obs
+        self._head = (self._head + 1) % self.num_frames
     
     def get_frame_history(self):
         """Get current frame history for debugging."""
-        return list(self.frames)
+        return list(self._get_stacked_obs())
     
     def clear_frames(self):
         """Clear frame buffer between episodes."""
-        self.frames.clear()
\ No newline at end of file
+        self._buf.fill(0)
+        self._head = 0
\ No newline at end of file
@@ -1,6 +1,8 @@
+import os
 from .base import BaseWrapper
 import numpy as np
 from gymnasium.spaces import Box
+from ._kernels import welford_normalize, normalize
 
 class NormalizeObservations(BaseWrapper):
     def __init__(self, env, config):
@@ -8,12 +10,21 @@ class NormalizeObservations(BaseWrapper):
         shape = self.env.observation_space.shape
         self.epsilon = float(config.get("epsilon", 1e-8))
 
-        self.momentum = float(config.get("momentum", 0.99))
         self.reset_stats_on_episode = bool(config.get("reset_stats_on_episode", False))
+        # Defer stat updates: buffer training obs and merge them in one batch on flush_stats()
+        self.deferred_stats = bool(config.get("deferred_stats", False))
+        self._pending = []
         self.training = True
-        
-        self.running_mean = np.zeros(shape, dtype=np.float32)
-        self.running_std = np.ones(shape, dtype=np.float32)
+
+        # Welford accumulators (float64 for stability); std is derived lazily from M2
+        self.count = 0
+        self.running_mean = np.zeros(shape, dtype=np.float64)
+        self._m2 = np.zeros(shape, dtype=np.float64)
+        self._std = None
+        self._inv_std = None
+        # Scratch for the numpy fallback's in-place stat update; reused every step and across resets
+        self._delta = np.empty(shape, dtype=np.float64)
+        self._delta2 = np.empty(shape, dtype=np.float64)
 
     @property
     def observation_space(self):
@@ -26,49 +37,111 @@ class NormalizeObservations(BaseWrapper):
             dtype=np.float32
         )
 
-    def step(self, action, **kwargs):
-        obs, reward, terminated, truncated, info = self.env.step(action, **kwargs)
+    @property
+    def running_std(self):
+        """Sample std of seen observations (1 until two samples); cached between updates."""
+        if self._std is None:
+            if self.count > 1:
+                self._std = np.sqrt(self._m2 / (self.count - 1)).astype(np.float32)
+            else:
+                self._std = np.ones(self.running_mean.shape, dtype=np.float32)
+        return self._std
+
+    @property
+    def inv_std(self):
+        """1 / (running_std + epsilon), recomputed only when the stats change."""
+        if self._inv_std is None:
+            self._inv_std = np.reciprocal(self.running_std + np.float32(self.epsilon))
+        return self._inv_std
+
+    def _invalidate_std(self):
+        """Drop cached std/inverse std after the running stats change."""
+        self._std = None
+        self._inv_std = None
+
+    def _transform_step(self, obs, reward):
+        obs = np.ascontiguousarray(obs)
         if self.training:
-            self._update_stats(obs)
-        normalized_obs = self._normalize(obs)
-        return normalized_obs.astype(np.float32), reward, terminated, truncated, info
+            if self.deferred_stats:
+                self._pending.append(obs)
+            else:
+                # Update and normalize in a single fused kernel pass
+                self.count += 1
+                self._invalidate_std()
+                normalized = welford_normalize(
+                    self.running_mean, self._m2, obs, self.count, self.epsilon, self._delta, self._delta2
+                )
+                return normalized, reward
+        return self._normalize(obs), reward
     
     def reset(self, **kwargs):
         obs, info = self.env.reset(**kwargs)
         if self.training and self.reset_stats_on_episode:
             self._reset_stats()
-        normalized_obs = self._normalize(obs)
-        return normalized_obs.astype(np.float32), info
+        return self._normalize(np.ascontiguousarray(obs)), info
     
-    def _update_stats(self, obs):
-        """Updates the running mean and std"""
-        m = self.momentum
-        old_mean = self.running_mean
-        old_var = self.running_std ** 2
-        new_mean = m * old_mean + obs * (1 - m)
-        new_var = old_var * m + (obs - old_mean) ** 2 * (1 - m)
-        new_std = np.sqrt(new_var)
-        self.running_mean = new_mean.astype(np.float32)
-        self.running_std = new_std.astype(np.float32)
-
-
-    def _normalize(self, obs):
-        """Normalize observations to have mean 0 and std 1"""
-        return (obs - self.running_mean) / (self.running_std + self.epsilon)
+    def update_from_batch(self, batch):
+        """Merge a (B, *obs_shape) batch into the running stats (Chan et al. parallel combine)."""
+        batch = np.asarray(batch, dtype=np.float64)
+        n_b = batch.shape[0]
+        if n_b == 0:
+            return
+        mean_b = batch.mean(axis=0)
+        m2_b = ((batch - mean_b) ** 2).sum(axis=0)
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.running_mean
+        self.running_mean += delta * (n_b / n)
+        self._m2 += m2_b + delta * delta * (n_a * n_b / n)
+        self.count = n
+        self._invalidate_std()
+
+    def flush_stats(self):
+        """Apply observations buffered while `deferred_stats` is enabled."""
+        if self._pending:
+            self.update_from_batch(np.stack(self._pending))
+            self._pending.clear()
+
+    def _normalize(self, obs, out=None):
+        """Normalize observations to have mean 0 and std 1 into float32 `out` (fresh if None)"""
+        if out is None:
+            out = np.empty(obs.shape, dtype=np.float32)
+        return normalize(obs, self.running_mean, self.inv_std, out)
     
     def save_stats(self, path):
-        np.save(f"{path}/running_mean.npy", self.running_mean)
-        np.save(f"{path}/running_std.npy", self.running_std)
+        _save_npy(f"{path}/running_mean.npy", self.running_mean)
+        _save_npy(f"{path}/running_std.npy", self.running_std)
+        _save_npy(f"{path}/running_count.npy", np.asarray(self.count))
 
 
     def load_stats(self, path):
-        self.running_mean = np.load(f"{path}/running_mean.npy").astype(np.float32)
-        self.running_std = np.load(f"{path}/running_std.npy").astype(np.float32)
+        # Copy-on-write mapping: no read+copy up front, pages are privately copied only when updated
+        mean = np.load(f"{path}/running_mean.npy", mmap_mode="c")
+        self.running_mean = mean if mean.dtype == np.float64 else mean.astype(np.float64)
+        std = np.load(f"{path}/running_std.npy", mmap_mode="r").astype(np.float64)
+        try:
+            self.count = int(np.load(f"{path}/running_count.npy"))
+        except FileNotFoundError:
+            # Stats saved before counts were stored: treat std as a 2-sample estimate
+            self.count = 2
+        self._m2 = std ** 2 * max(self.count - 1, 1)
+        self._invalidate_std()
 
     def _reset_stats(self):
-        shape = self.env.observation_space.shape
-        self.running_mean = np.zeros(shape, dtype=np.float32)
-        self.running_std = np.ones(shape, dtype=np.float32)
+        # Zero in place so resets do not reallocate the accumulators
+        self.count = 0
+        self.running_mean.fill(0.0)
+        self._m2.fill(0.0)
+        self._invalidate_std()
+        self._pending.clear()
 
     def set_training(self, training: bool) -> None:
-        self.training = bool(training)
\ No newline at end of file
+        self.training = bool(training)
+
+
+def _save_npy(path, arr):
+    """np.save via a temp file + rename, so a live mmap of the old file stays valid."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, path)
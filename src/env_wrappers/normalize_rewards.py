@@ -1,44 +1,68 @@
 from .base import BaseWrapper
 import numpy as np
 from math import sqrt
+from ._kernels import welford_scalar
 
 class NormalizeRewards(BaseWrapper):
     def __init__(self, env, config):
         """Initialize reward normalization wrapper."""
         super().__init__(env, config)
 
+        # Welford accumulators; std is derived from M2
+        self.count = 0
         self.running_mean = 0.0
-        self.running_std = 1.0
-        self.epsilon = 1e-8
+        self._m2 = 0.0
+        self._inv_std = None
+        self.epsilon = float(config.get("epsilon", 1e-8))
         self.training = True
 
-    def step(self, action, **kwargs):
-        """Take a step and normalize rewards"""
-        obs, reward, terminated, truncated, info = self.env.step(action, **kwargs)
-        if self.training:
-            self._update_stats(reward)
-        normalized_reward = self._normalize_reward(reward)
-        return obs, normalized_reward, terminated, truncated, info
-    
-    def _update_stats(self, reward):
-        """Update running statistics for reward normalization."""
-        old_mean = self.running_mean
-        old_var = self.running_std ** 2
+    @property
+    def running_std(self):
+        """Sample std of seen rewards (1.0 until two samples)."""
+        if self.count > 1:
+            return sqrt(self._m2 / (self.count - 1))
+        return 1.0
 
-        self.running_mean = old_mean * 0.99 + reward * 0.01
-        new_var = old_var * 0.99 + (reward - old_mean) ** 2 * 0.01
-        self.running_std = sqrt(new_var)
+    @property
+    def inv_std(self):
+        """1 / (running_std + epsilon), recomputed only when the stats change."""
+        if self._inv_std is None:
+            self._inv_std = 1.0 / (self.running_std + self.epsilon)
+        return self._inv_std
 
+    def _transform_step(self, obs, reward):
+        """Normalize the step's reward"""
+        if self.training:
+            self.count += 1
+            self._inv_std = None
+            self.running_mean, self._m2, normalized_reward = welford_scalar(
+                self.running_mean, self._m2, float(reward), self.count, self.epsilon
+            )
+            return obs, normalized_reward
+        return obs, self._normalize_reward(reward)
+    
     def _normalize_reward(self, reward):
         """Normalize reward to have mean 0 and std 1."""
-        return (reward - self.running_mean) / (self.running_std + self.epsilon)
+        return (reward - self.running_mean) * self.inv_std
     
     def save_stats(self, path):
         """Save reward normalization statistics to file."""
         np.save(f"{path}/reward_running_mean.npy", self.running_mean)
         np.save(f"{path}/reward_running_std.npy", self.running_std)
+        np.save(f"{path}/reward_running_count.npy", self.count)
 
     def load_stats(self, path):
         """Load reward normalization statistics from file."""
-        self.running_mean = np.load(f"{path}/reward_running_mean.npy")
-        self.running_std = np.load(f"{path}/reward_running_std.npy")
\ No newline at end of file
+        self.running_mean = float(np.load(f"{path}/reward_running_mean.npy"))
+        std = float(np.load(f"{path}/reward_running_std.npy"))
+        try:
+            self.count = int(np.load(f"{path}/reward_running_count.npy"))
+        except FileNotFoundError:
+            # Stats saved before counts were stored: treat std as a 2-sample estimate
+            self.count = 2
+        self._m2 = std * std * max(self.count - 1, 1)
+        self._inv_std = None
+
+    def set_training(self, training: bool) -> None:
+        """Freeze (False) or resume (True) running-stat updates."""
+        self.training = bool(training)
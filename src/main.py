@@ -4,16 +4,29 @@ Main entry point for RL experiments.
 Reads configuration and orchestrates experiment runs.
 """
 
+import copy
+import functools
+import os
 import yaml
 import argparse
 from pathlib import Path
 from .runners.experiment import run_experiment
+from .utils.config import YamlLoader
 from .utils.seeding import set_global_seed
 
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(path, mtime):
+    """Parse a YAML file; `mtime` is part of the key so edited files are re-read."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
 def load_config(config_path):
     """Load configuration from YAML file."""
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+    path = os.fspath(config_path)
+    # Callers may mutate the config, so hand out a copy of the cached parse
+    return copy.deepcopy(_load_cached(path, os.path.getmtime(path)))
 
 
 def main():
@@ -1,75 +1,131 @@
+import copy
 from torch import nn
+import torch.nn.functional as F
 from typing import Tuple, Optional, Any
 import torch
 
-class PolicyNetwork(nn.Module):
+
+# Old checkpoints stored each Linear as layerN; they now live at index 2*(N-1) of `net`
+_LEGACY_LAYER_KEYS = {"layer1.": "net.0.", "layer2.": "net.2.", "layer3.": "net.4."}
+
+
+def _mlp(input_size, hidden_size, output_size):
+    """Two-hidden-layer ReLU MLP as a single Sequential (in-place activations)."""
+    return nn.Sequential(
+        nn.Linear(input_size, hidden_size),
+        nn.ReLU(inplace=True),
+        nn.Linear(hidden_size, hidden_size),
+        nn.ReLU(inplace=True),
+        nn.Linear(hidden_size, output_size),
+    )
+
+
+def _remap_legacy_keys(module, state_dict, prefix, *args):
+    """load_state_dict pre-hook translating layerN.* keys to net.* keys."""
+    for key in [k for k in state_dict if k.startswith(prefix)]:
+        local = key[len(prefix):]
+        for old, new in _LEGACY_LAYER_KEYS.items():
+            if local.startswith(old):
+                state_dict[prefix + new + local[len(old):]] = state_dict.pop(key)
+                break
+
+
+class _Cast(nn.Module):
+    """Cast activations to `dtype` (bridges fp32 callers and low-precision weights)."""
+    def __init__(self, dtype):
+        super().__init__()
+        self.dtype = dtype
+
+    def forward(self, x):
+        return x.to(self.dtype)
+
+
+class _MLP(nn.Module):
+    """Shared base for the Sequential-trunk networks below."""
+
+    def to_inference(self, dtype="bf16", example_obs=None):
+        """Return a frozen copy for rollout collection.
+
+        `dtype` "bf16" casts the weights (inputs/outputs stay fp32), "int8" applies
+        dynamic int8 quantization to the Linear layers (CPU only), None keeps fp32.
+        With `example_obs` the trunk is also traced to TorchScript and frozen with
+        `optimize_for_inference`, fusing Linear+ReLU and dropping eager dispatch.
+        The original fp32 module is untouched and keeps training.
+        """
+        if dtype not in (None, "bf16", "int8"):
+            raise ValueError(f"Unsupported inference dtype: {dtype}")
+        # Skip (then drop) instance-level overrides such as a torch.compile'd get_action
+        override = self.__dict__.get("get_action")
+        memo = {id(override): None} if override is not None else {}
+        twin = copy.deepcopy(self, memo).eval().requires_grad_(False)
+        twin.__dict__.pop("get_action", None)
+        if dtype == "bf16":
+            twin.net = nn.Sequential(_Cast(torch.bfloat16), twin.net.to(torch.bfloat16), _Cast(torch.float32))
+        elif dtype == "int8":
+            twin.net = torch.ao.quantization.quantize_dynamic(twin.net, {nn.Linear}, dtype=torch.qint8)
+        if example_obs is not None:
+            with torch.no_grad():
+                traced = torch.jit.trace(twin.net, example_obs)
+            twin.net = torch.jit.optimize_for_inference(traced)
+        return twin
+
+
+def _init_mlp(module, input_size, hidden_size, output_size, compile):
+    module.net = _mlp(input_size, hidden_size, output_size)
+    if compile:
+        # Module.compile compiles in place, so state_dict keys keep no `_orig_mod` prefix
+        module.net.compile(mode="reduce-overhead", dynamic=False)
+    module._register_load_state_dict_pre_hook(_remap_legacy_keys, with_module=True)
+
+
+class PolicyNetwork(_MLP):
     """Neural network that outputs action probabilities or action distributions."""
-    def __init__(self, input_size, hidden_size, num_actions):
+    def __init__(self, input_size, hidden_size, num_actions, compile: bool = False):
         super().__init__()
-        self.layer1 = nn.Linear(input_size, hidden_size)
-        self.layer2 = nn.Linear(hidden_size, hidden_size)
-        self.layer3 = nn.Linear(hidden_size, num_actions)
-        self.activation = nn.ReLU()
+        _init_mlp(self, input_size, hidden_size, num_actions, compile)
 
 
     def forward(self, obs: torch.Tensor) -> torch.Tensor:
         """Forward pass through the policy network."""
-        out = self.layer1(obs)
-        out = self.activation(out)
-        out = self.layer2(out)
-        out = self.activation(out)
-        out = self.layer3(out)
-        return out
+        return self.net(obs)
 
     
     def get_action(self, obs: torch.Tensor, deterministic: bool = False) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
-        """Sample an action from the policy distribution."""
-        logits = self.forward(obs)
-        
-        distr = torch.distributions.Categorical(logits=logits)
+        """Sample an action from the policy distribution (under the caller's grad mode)."""
+        # Direct tensor ops instead of a Categorical: no per-call distribution object or arg validation
+        log_probs = F.log_softmax(self.forward(obs), dim=-1)
 
         if deterministic:
-            action = distr.mode
+            action = log_probs.argmax(dim=-1)
         else:
-            action = distr.sample()
-        
-        log_prob = distr.log_prob(action)
+            # Gumbel-max: argmax(log p + G), G = -log(Exp(1)) ~ Gumbel(0, 1); no softmax/cumsum
+            gumbel = torch.empty_like(log_probs).exponential_().log_().neg_()
+            action = (log_probs + gumbel).argmax(dim=-1)
+
+        log_prob = log_probs.gather(-1, action.unsqueeze(-1)).squeeze(-1)
 
         return action, log_prob
     
     def get_action_log_prob(self, obs: torch.Tensor, action: torch.Tensor) -> torch.Tensor:
         """Get log probability of taking a specific action."""
-        logits = self.forward(obs)
-
-        distr = torch.distributions.Categorical(logits=logits)
-
-        return distr.log_prob(action)
+        log_probs = F.log_softmax(self.forward(obs), dim=-1)
+        return log_probs.gather(-1, action.long().unsqueeze(-1)).squeeze(-1)
     
     def get_entropy(self, obs: torch.Tensor) -> torch.Tensor:
         """Get entropy of the policy distribution."""
-        logits = self.forward(obs)
-        distr = torch.distributions.Categorical(logits=logits)
-
-        return distr.entropy
+        log_probs = F.log_softmax(self.forward(obs), dim=-1)
+        return -(log_probs.exp() * log_probs).sum(dim=-1)
 
 
-class ValueNetwork(nn.Module):
+class ValueNetwork(_MLP):
     """Neural network that estimates state values."""
-    def __init__(self, input_size, hidden_size):
+    def __init__(self, input_size, hidden_size, compile: bool = False):
         super().__init__()
-        self.layer1 = nn.Linear(input_size, hidden_size)
-        self.layer2 = nn.Linear(hidden_size, hidden_size)
-        self.layer3 = nn.Linear(hidden_size, 1)
-        self.activation = nn.ReLU()
+        _init_mlp(self, input_size, hidden_size, 1, compile)
 
     def forward(self, obs: torch.Tensor) -> torch.Tensor:
         """Forward pass through the value network."""
-        out = self.layer1(obs)
-        out = self.activation(out)
-        out = self.layer2(out)
-        out = self.activation(out)
-        out = self.layer3(out)
-        return out
+        return self.net(obs)
     
     def get_value(self, obs: torch.Tensor) -> torch.Tensor:
         """Get estimated value for given observation."""
@@ -77,24 +133,16 @@ class ValueNetwork(nn.Module):
          
 
 
-class QNetwork(nn.Module):
+class QNetwork(_MLP):
     """Neural network that estimates Q-values for state-action pairs."""
-    def __init__(self, input_size, hidden_size, num_actions):
+    def __init__(self, input_size, hidden_size, num_actions, compile: bool = False):
         super().__init__()
         self.num_actions = num_actions
-        self.layer1 = nn.Linear(input_size, hidden_size)
-        self.layer2 = nn.Linear(hidden_size, hidden_size)
-        self.layer3 = nn.Linear(hidden_size, num_actions)
-        self.activation = nn.ReLU()
+        _init_mlp(self, input_size, hidden_size, num_actions, compile)
 
     def forward(self, obs: torch.Tensor) -> torch.Tensor:
         """Forward pass through the Q-network."""
-        out = self.layer1(obs)
-        out = self.activation(out)
-        out = self.layer2(out)
-        out = self.activation(out)
-        out = self.layer3(out)
-        return out
+        return self.net(obs)
     
     def get_q_values(self, obs: torch.Tensor) -> torch.Tensor:
         """Get Q-values for all actions."""
@@ -102,8 +150,7 @@ class QNetwork(nn.Module):
     
     def get_max_q_value(self, obs: torch.Tensor) -> torch.Tensor:
         """Get maximum Q-value over all possible actions."""
-        q_vals = self.get_q_values(obs)
-        return torch.max(q_vals, dim=-1)[0]
+        return self.get_q_values(obs).amax(dim=-1)
     
     def get_action(self, obs: torch.Tensor) -> torch.Tensor:
         """Get best action (greedy selection)."""
@@ -10,6 +10,9 @@ from src.env_wrappers.env_factory import EnvironmentFactory
 from src.runners.off_policy_trainer import OffPolicyTrainer
 from src.runners.on_policy_trainer import OnPolicyTrainer
 
+# On-policy algorithms collect rollouts from all sub-envs per step, so they default to async vector envs
+ON_POLICY_ALGOS = {"PPO", "GRPO"}
+
 class ExperimentRunner:
     """Coordinates environment creation, agent building, and training/evaluation.
 
@@ -47,7 +50,10 @@ class ExperimentRunner:
         """
         env_name = self.env_cfg.get("env_name")
         factory = EnvironmentFactory()
-        return factory.create_env(env_name, config=self.config)
+        vector_mode = None
+        if self.algo_cfg.get("type") in ON_POLICY_ALGOS and not self.env_cfg.get("vector_mode"):
+            vector_mode = "async"
+        return factory.create_env(env_name, config=self.config, vector_mode=vector_mode)
 
     def create_agent(self, env: Any) -> Any:
         """Construct and return the agent instance for the specified environment.
@@ -65,7 +71,7 @@ class ExperimentRunner:
         algo_type = (self.algo_cfg or {}).get("type")
         if algo_type in {"DQN", "SARSA", "RANDOM"}:
             return OffPolicyTrainer(agent, env, self.config)
-        elif algo_type in {"PPO", "GRPO"}:
+        elif algo_type in ON_POLICY_ALGOS:
             return OnPolicyTrainer(agent, env, self.config)
         raise ValueError(f"Unknown or unsupported algorithm type: {algo_type}")
 
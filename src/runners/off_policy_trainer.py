@@ -1,10 +1,38 @@
 from typing import Any, Mapping, Dict, Optional, Tuple
+from src.utils.buffer import Prefetcher, ReplayBuffer
 from .trainer import Trainer
 
 class OffPolicyTrainer(Trainer):
     def __init__(self, agent: Any, env: Any, config: Mapping[str, Any]) -> None:
         """Initialize off-policy trainer state (e.g., replay buffer)."""
         super().__init__(agent, env, config)
+        # Batches queued ahead by a background sampler; 0 samples on the training thread
+        self._prefetch_depth = int(config.get("replay_buffer", {}).get("prefetch_depth", 2))
+        self._batch_size = int(config.get("training", {}).get("batch_size", 64))
+        self._prefetcher: Optional[Prefetcher] = None
+
+    def next_batch(self, buffer: ReplayBuffer, device: Any = "cpu") -> Dict[str, Any]:
+        """Return the next training batch from `buffer` as tensors on `device`.
+
+        With `replay_buffer.prefetch_depth > 0` a `Prefetcher` is started on the first
+        call once the buffer is ready and batches are drawn from its queue; until then
+        batches are sampled here. A sampling error, or a call with a different buffer
+        or device than the prefetcher was built for, stops it; a fresh one is started.
+        """
+        if self._prefetcher is not None and not self._prefetcher.serves(buffer, device):
+            self._prefetcher.close()
+            self._prefetcher = None
+        if self._prefetcher is None:
+            if self._prefetch_depth <= 0 or not (len(buffer) and buffer.ready()):
+                return buffer.sample_torch(self._batch_size, device)
+            self._prefetcher = Prefetcher(buffer, self._batch_size, device, depth=self._prefetch_depth)
+        try:
+            return self._prefetcher.get()
+        except Exception:
+            # The sampling thread has exited; a later get() would block forever
+            self._prefetcher.close()
+            self._prefetcher = None
+            raise
 
     def train_episode(self, episode_index: int) -> Tuple[float, int, Optional[float]]:
         """Interact, push to replay, sample batches, and update Q/policy."""
@@ -28,8 +56,8 @@ class OffPolicyTrainer(Trainer):
 
     def close(self) -> None:
         """Close envs/loggers and flush any pending artifacts."""
-        if hasattr(self.env, "close"):
-            self.env.close()
-        if hasattr(self.agent, "close"):
-            self.agent.close()
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        super().close()
         
\ No newline at end of file
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import copy
+import functools
+import json
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Mapping, Optional, Tuple, Union
-from src.utils.eval import set_env_training_mode
+from src.utils.eval import set_env_training_mode, flush_env_stats, forget_env
+import gymnasium as gym
+import numpy as np
 import torch
 
 class Trainer(ABC):
@@ -12,6 +18,19 @@ class Trainer(ABC):
         self.agent = agent
         self.env = env
         self.config = config
+        # Resolved once: the agent keeps the same network module for its lifetime
+        self._network = getattr(agent, "network", None)
+        # Checkpoints are staged to CPU synchronously and written to disk on a background thread
+        exp_cfg = config.get("experiment", {})
+        self._async_checkpoint = bool(exp_cfg.get("async_checkpoint", True))
+        # Periodic checkpoints go to `<checkpoint_dir>/<checkpoint_prefix><episode>.pt`
+        self._ckpt_dir = Path(exp_cfg.get("checkpoint_dir", "."))
+        self._ckpt_prefix = str(exp_cfg.get("checkpoint_prefix", "checkpoint_"))
+        self._ckpt_executor: Optional[ThreadPoolExecutor] = None
+        self._ckpt_future = None
+        self._ckpt_stage: Dict[Any, Any] = {}
+        # Copies of a single env to run evaluation episodes on concurrently
+        self._eval_num_envs = int(config.get("evaluation", {}).get("num_envs", 1))
 
     @abstractmethod
     def train_episode(self, episode_index: int) -> Tuple[float, int, Optional[float]]:
@@ -22,38 +41,110 @@ class Trainer(ABC):
         """Evaluate policy for given episodes and return aggregate metrics."""
         # Switch wrappers and policy to evaluation behavior
         set_env_training_mode(self.env, False)
-        had_network = hasattr(self.agent, "network")
-        prev_training = self.agent.network.training if had_network else None
-        if had_network:
-            self.agent.network.eval()
+        self.agent.set_mode(False)
+        network = self._network
+        prev_training = network is not None and network.training
+        if network is not None:
+            network.eval()
 
-        rewards: list[float] = []
-        lengths: list[int] = []
+        if getattr(self.env, "num_envs", 1) > 1:
+            rewards, lengths = self._run_vector_episodes(num_episodes)
+        elif self._eval_num_envs > 1 and num_episodes > 1:
+            # Copies are taken in eval mode, so they carry the current frozen wrapper stats
+            n = min(self._eval_num_envs, num_episodes)
+            make_env = functools.partial(copy.deepcopy, self.env)
+            eval_env = gym.vector.SyncVectorEnv([make_env] * n)
+            # Copies share the env's RNG state; distinct seeds keep their episodes independent
+            base = int(self.env.np_random.integers(2**31 - n))
+            try:
+                rewards, lengths = self._run_vector_episodes(num_episodes, eval_env, seed=[base + i for i in range(n)])
+            finally:
+                eval_env.close()
+        else:
+            rewards, lengths = self._run_episodes(num_episodes)
+
+        # Restore training state
+        if prev_training:
+            network.train()
+        self.agent.set_mode(True)
+        set_env_training_mode(self.env, True)
+
+        if not len(rewards):
+            return {"reward_mean": 0.0, "length_mean": 0.0}
+        return {
+            "reward_mean": float(rewards.mean()),
+            "length_mean": float(lengths.mean()),
+        }
+
+    def _run_episodes(self, num_episodes: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Play `num_episodes` sequentially on a single env; return (rewards, lengths)."""
+        rewards = np.empty(num_episodes, dtype=np.float64)
+        lengths = np.empty(num_episodes, dtype=np.int64)
+        # Bind hot-loop callables once; attribute lookups per env step add up on fast envs
+        env_step = self.env.step
+        env_reset = self.env.reset
+        select = self.agent.select_action
         with torch.inference_mode():
-            for _ in range(num_episodes):
-                obs, _ = self.env.reset()
+            for i in range(num_episodes):
+                obs, _ = env_reset()
                 done = False
                 episode_reward = 0.0
                 episode_length = 0
                 while not done:
-                    action, _ = self.agent.select_action(obs, training=False)
-                    obs, reward, terminated, truncated, _ = self.env.step(action)
-                    done = bool(terminated or truncated)
-                    episode_reward += float(reward)
+                    action, _ = select(obs)
+                    obs, reward, terminated, truncated, _ = env_step(action)
+                    done = terminated or truncated
+                    episode_reward += reward
                     episode_length += 1
-                rewards.append(episode_reward)
-                lengths.append(episode_length)
+                rewards[i] = episode_reward
+                lengths[i] = episode_length
+        return rewards, lengths
 
-        # Restore training state
-        if had_network and prev_training:
-            self.agent.network.train()
-        set_env_training_mode(self.env, True)
+    def _run_vector_episodes(
+        self, num_episodes: int, env: Any = None, seed: Optional[Any] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Play `num_episodes` across the sub-envs of a vector env (default `self.env`) with batched action selection.
 
-        n = max(len(rewards), 1)
-        return {
-            "reward_mean": sum(rewards) / n,
-            "length_mean": sum(lengths) / n,
-        }
+        `seed` is passed to the initial `reset` (an int or one seed per sub-env).
+
+        Episodes are split evenly over sub-envs up front, so short episodes are not
+        over-represented by envs that happen to finish first.
+        """
+        env = self.env if env is None else env
+        n = env.num_envs
+        quota = np.full(n, num_episodes // n, dtype=np.int64)
+        quota[: num_episodes % n] += 1
+        # Gymnasium >= 1.0 resets a finished sub-env on the *next* step (its reward/obs are not episode data)
+        mode = (getattr(env, "metadata", None) or {}).get("autoreset_mode")
+        next_step_reset = getattr(mode, "name", mode) == "NEXT_STEP"
+
+        env_step = env.step
+        select = self.agent.select_actions
+        ep_reward = np.zeros(n, dtype=np.float64)
+        ep_length = np.zeros(n, dtype=np.int64)
+        skip = np.zeros(n, dtype=bool)
+        rewards = np.empty(num_episodes, dtype=np.float64)
+        lengths = np.empty(num_episodes, dtype=np.int64)
+        filled = 0
+        with torch.inference_mode():
+            obs, _ = env.reset(seed=seed)
+            while quota.any():
+                actions, _ = select(obs)
+                obs, reward, terminated, truncated, _ = env_step(actions)
+                live = ~skip
+                ep_reward[live] += reward[live]
+                ep_length[live] += 1
+                done = (terminated | truncated) & live
+                finished = np.flatnonzero(done & (quota > 0))
+                if finished.size:
+                    rewards[filled:filled + finished.size] = ep_reward[finished]
+                    lengths[filled:filled + finished.size] = ep_length[finished]
+                    filled += finished.size
+                    quota[finished] -= 1
+                ep_reward[done] = 0.0
+                ep_length[done] = 0
+                skip = done if next_step_reset else skip
+        return rewards, lengths
 
     def train(
         self,
@@ -65,17 +156,26 @@ class Trainer(ABC):
         """Run the training loop with optional periodic evaluation and checkpoints."""
         self.before_training()
         set_env_training_mode(self.env, True)
+        self.agent.set_mode(True)
+        # Episode counts (1-based) at which the next eval/checkpoint fires; None disables
+        next_eval = eval_every or None
+        next_ckpt = checkpoint_every or None
+        if next_ckpt is not None:
+            self._ckpt_dir.mkdir(parents=True, exist_ok=True)
         try:
             for episode_idx in range(num_episodes):
                 self.before_episode(episode_idx)
                 reward, length, loss = self.train_episode(episode_idx)
+                flush_env_stats(self.env)
                 self.after_episode(episode_idx, reward, length, loss)
 
-                if eval_every and (episode_idx + 1) % eval_every == 0:
+                if episode_idx + 1 == next_eval:
+                    next_eval += eval_every
                     metrics = self.evaluate(eval_episodes)
                     self.after_evaluation(episode_idx, metrics)
 
-                if checkpoint_every and (episode_idx + 1) % checkpoint_every == 0:
+                if episode_idx + 1 == next_ckpt:
+                    next_ckpt += checkpoint_every
                     path = self._checkpoint_path(episode_idx)
                     self.save_checkpoint(path, metadata={"episode": episode_idx})
         finally:
@@ -88,25 +188,57 @@ class Trainer(ABC):
     ) -> None:
         """Persist agent state using the agent's checkpoint format.
 
-        Note: `metadata` (if provided) is saved to a sidecar file `<path>.meta.pt`.
+        Note: `metadata` (if provided) is saved to a JSON sidecar file `<path>.meta.json`.
+        With `experiment.async_checkpoint` the state is copied to (pinned) CPU buffers
+        here and the files are written on a background thread; see `wait_for_checkpoint`.
         """
-        # Delegate main weights/state to the agent. This defines the canonical format.
-        self.agent.save(path)
+        if not self._async_checkpoint or not hasattr(self.agent, "state_to_cpu"):
+            # Delegate main weights/state to the agent. This defines the canonical format.
+            self.agent.save(path)
+            self._write_metadata(path, metadata)
+            return
+        # The staging buffers are reused, so the previous write must be done first
+        self.wait_for_checkpoint()
+        state = self.agent.state_to_cpu(stage=self._ckpt_stage)
+        if self._ckpt_executor is None:
+            self._ckpt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._ckpt_future = self._ckpt_executor.submit(self._write_checkpoint, state, path, metadata)
+
+    def _write_checkpoint(self, state: Any, path: Union[str, Path], metadata: Optional[Dict[str, Any]]) -> None:
+        self.agent.write_checkpoint(state, path)
+        self._write_metadata(path, metadata)
+
+    def _write_metadata(self, path: Union[str, Path], metadata: Optional[Dict[str, Any]]) -> None:
         # Optionally persist trainer metadata to a sidecar, without constraining the agent format.
         if metadata is not None:
-            sidecar = f"{str(path)}.meta.pt"
-            torch.save(metadata, sidecar)
+            sidecar = f"{str(path)}.meta.json"
+            with open(sidecar, "w") as f:
+                json.dump(metadata, f)
+
+    def wait_for_checkpoint(self) -> None:
+        """Block until any in-flight background checkpoint write finishes (re-raising its error)."""
+        future, self._ckpt_future = self._ckpt_future, None
+        if future is not None:
+            future.result()
 
 
     def load_checkpoint(self, path: Union[str, Path]) -> None:
         """Restore agent state from the specified path using the agent's format."""
+        self.wait_for_checkpoint()
         # Delegate to the agent to load its own checkpoint format
         self.agent.load(path)
 
     def close(self) -> None:
         """Release resources (e.g., environments, loggers, file handles)."""
+        try:
+            self.wait_for_checkpoint()
+        finally:
+            if self._ckpt_executor is not None:
+                self._ckpt_executor.shutdown(wait=True)
+                self._ckpt_executor = None
         if hasattr(self.env, "close"):
             self.env.close()
+            forget_env(self.env)
         if hasattr(self.agent, "close"):
             self.agent.close()
     
@@ -128,4 +260,4 @@ class Trainer(ABC):
         return None
     def _checkpoint_path(self, episode_index: int) -> Path: 
         """Compute a checkpoint path for an episode index."""
-        return Path(f"checkpoint_{episode_index+1}.pt")
\ No newline at end of file
+        return self._ckpt_dir / f"{self._ckpt_prefix}{episode_index+1}.pt"
\ No newline at end of file
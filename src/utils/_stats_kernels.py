@@ -0,0 +1,231 @@
+"""Numeric kernels behind the Plotter's smoothing and confidence bands.
+
+Each kernel has a Numba version (compiled through `src.utils.jit`) and a
+NumPy fallback; the public names bind to whichever applies.
+"""
+
+import threading
+import warnings
+
+import numpy as np
+
+from src.utils.jit import njit, prange, NUMBA_AVAILABLE
+
+# The NumPy bootstrap gathers (n_boot, n_runs, block) at once; block keeps that near L3 size
+BOOTSTRAP_BLOCK_BYTES = 8 << 20
+# fastmath minus `nnan`/`ninf`: those would let LLVM drop the isnan checks that skip padded runs
+FASTMATH_NAN_SAFE = {"nsz", "arcp", "contract", "afn", "reassoc"}
+# Run counts up to this get an aggregate kernel generated with the run loops unrolled
+UNROLL_MAX_RUNS = 8
+# Exact argument types of the aggregate kernels (runs, idx, level, out)
+AGGREGATE_SIGNATURE = "void(float32[:, ::1], int32[:, ::1], float64, float64[:, ::1])"
+
+
+@njit(cache=True, fastmath=True)
+def _rolling_mean_std_jit(a, window):
+    n = a.shape[0] - window + 1
+    mean = np.empty(n, dtype=np.float64)
+    std = np.empty(n, dtype=np.float64)
+    s = 0.0
+    sq = 0.0
+    for i in range(window):
+        v = float(a[i])
+        s += v
+        sq += v * v
+    for i in range(n):
+        if i:
+            old = float(a[i - 1])
+            new = float(a[i + window - 1])
+            s += new - old
+            sq += new * new - old * old
+        m = s / window
+        mean[i] = m
+        std[i] = np.sqrt(max(sq / window - m * m, 0.0))
+    return mean, std
+
+
+def _rolling_mean_std_np(a, window):
+    cs = np.zeros(a.shape[0] + 1, dtype=np.float64)
+    np.cumsum(a, dtype=np.float64, out=cs[1:])
+    mean = (cs[window:] - cs[:-window]) / window
+    np.cumsum(np.square(a, dtype=np.float64), out=cs[1:])
+    var = (cs[window:] - cs[:-window]) / window - mean * mean
+    return mean, np.sqrt(np.maximum(var, 0.0, out=var), out=var)
+
+
+@njit(cache=True, fastmath=True)
+def _interp_quantile(sorted_vals, q):
+    pos = q * (sorted_vals.shape[0] - 1)
+    lo = int(pos)
+    if lo + 1 >= sorted_vals.shape[0]:
+        return sorted_vals[lo]
+    return sorted_vals[lo] + (pos - lo) * (sorted_vals[lo + 1] - sorted_vals[lo])
+
+
+@njit(AGGREGATE_SIGNATURE, cache=True, fastmath=FASTMATH_NAN_SAFE, parallel=True, nogil=True)
+def _aggregate_jit(runs, idx, level, out):
+    n_boot, n_runs = idx.shape
+    n_ep = runs.shape[1]
+    for e in prange(n_ep):
+        s = 0.0
+        c = 0
+        for r in range(n_runs):
+            v = runs[r, e]
+            if not np.isnan(v):
+                s += v
+                c += 1
+        m = s / c if c else np.nan
+        out[0, e] = m
+        if n_runs < 2:
+            out[1, e] = m
+            out[2, e] = m
+            continue
+        means = np.empty(n_boot, dtype=np.float64)
+        k = 0
+        for b in range(n_boot):
+            s = 0.0
+            c = 0
+            for r in range(n_runs):
+                v = runs[idx[b, r], e]
+                if not np.isnan(v):
+                    s += v
+                    c += 1
+            # Resamples drawing only runs that ended before episode e carry no information
+            if c:
+                means[k] = s / c
+                k += 1
+        if k == 0:
+            out[1, e] = np.nan
+            out[2, e] = np.nan
+            continue
+        valid = np.sort(means[:k])
+        out[1, e] = _interp_quantile(valid, (1.0 - level) / 2)
+        out[2, e] = _interp_quantile(valid, (1.0 + level) / 2)
+
+
+_UNROLLED_TEMPLATE = """
+def _aggregate_r{n_runs}(runs, idx, level, out):
+    n_boot = idx.shape[0]
+    n_ep = runs.shape[1]
+    for e in prange(n_ep):
+        s = 0.0
+        c = 0
+{mean_body}
+        m = s / c if c else np.nan
+        out[0, e] = m
+        means = np.empty(n_boot, dtype=np.float64)
+        k = 0
+        for b in range(n_boot):
+            s = 0.0
+            c = 0
+{boot_body}
+            if c:
+                means[k] = s / c
+                k += 1
+        if k == 0:
+            out[1, e] = np.nan
+            out[2, e] = np.nan
+            continue
+        valid = np.sort(means[:k])
+        out[1, e] = _interp_quantile(valid, (1.0 - level) / 2)
+        out[2, e] = _interp_quantile(valid, (1.0 + level) / 2)
+"""
+
+_kernel_cache = {}
+_kernel_lock = threading.Lock()
+
+
+def _accumulate_lines(n_runs, row, indent):
+    pad = " " * indent
+    lines = []
+    for r in range(n_runs):
+        lines += [
+            f"{pad}v = runs[{row.format(r=r)}, e]",
+            f"{pad}if not np.isnan(v):",
+            f"{pad}    s += v",
+            f"{pad}    c += 1",
+        ]
+    return "\n".join(lines)
+
+
+def _make_unrolled(n_runs):
+    """Generate and compile `_aggregate_jit` with both run loops unrolled for `n_runs`."""
+    src = _UNROLLED_TEMPLATE.format(
+        n_runs=n_runs,
+        mean_body=_accumulate_lines(n_runs, "{r}", 8),
+        boot_body=_accumulate_lines(n_runs, "idx[b, {r}]", 12),
+    )
+    namespace = {"np": np, "prange": prange, "_interp_quantile": _interp_quantile}
+    exec(compile(src, f"<aggregate_r{n_runs}>", "exec"), namespace)
+    # Generated source has no file to cache against, so these compile once per process
+    return njit(AGGREGATE_SIGNATURE, fastmath=FASTMATH_NAN_SAFE, parallel=True, nogil=True)(
+        namespace[f"_aggregate_r{n_runs}"]
+    )
+
+
+def _aggregate_kernel(n_runs):
+    """Compiled aggregate kernel for `n_runs`: unrolled for small counts, the generic one otherwise."""
+    if not 2 <= n_runs <= UNROLL_MAX_RUNS:
+        return _aggregate_jit
+    kernel = _kernel_cache.get(n_runs)
+    if kernel is None:
+        with _kernel_lock:
+            kernel = _kernel_cache.get(n_runs)
+            if kernel is None:
+                kernel = _kernel_cache[n_runs] = _make_unrolled(n_runs)
+    return kernel
+
+
+def _aggregate_np(runs, idx, level, out):
+    n_boot, n_runs = idx.shape
+    n_ep = runs.shape[1]
+    q = [(1.0 - level) / 2, (1.0 + level) / 2]
+    # NaN-aware reductions are several times slower; only pay for them with padded runs
+    if np.isnan(runs).any():
+        mean_fn, quantile_fn = np.nanmean, np.nanquantile
+    else:
+        mean_fn, quantile_fn = np.mean, np.quantile
+    # All-NaN slices (resamples of runs that all ended early) are expected; they stay NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean_fn(runs, axis=0, dtype=np.float64, out=out[0])
+        if n_runs < 2:
+            out[1] = out[0]
+            out[2] = out[0]
+            return
+        block = max(1, BOOTSTRAP_BLOCK_BYTES // (n_boot * n_runs * runs.itemsize))
+        for start in range(0, n_ep, block):
+            stop = start + block
+            # One gather for every resample: (n_boot, n_runs, block)
+            means = mean_fn(runs[:, start:stop][idx], axis=1, dtype=np.float64)
+            out[1:, start:stop] = quantile_fn(means, q, axis=0)
+
+
+def rolling_mean_std(a, window):
+    """Trailing-window mean and population std of 1-D `a` (length `len(a) - window + 1`)."""
+    if NUMBA_AVAILABLE:
+        return _rolling_mean_std_jit(np.ascontiguousarray(a), int(window))
+    return _rolling_mean_std_np(a, int(window))
+
+
+def aggregate(runs2d, n_boot, level, out=None, seed=0):
+    """Per-episode mean and percentile-bootstrap CI of the mean over runs, in one pass.
+
+    `runs2d` is (n_runs, n_episodes), NaN where a run has no value. Rows of `out`
+    (allocated as (3, n_episodes) float64 when not given) receive mean, lo and hi;
+    nothing else is allocated per episode beyond the resample scratch. The
+    (n_boot, n_runs) resampling table is drawn once and shared by all episodes.
+    With Numba, run counts up to `UNROLL_MAX_RUNS` use a kernel generated for
+    that count; kernels are compiled eagerly for exact dtypes, so `out` must be
+    C-contiguous float64.
+    """
+    runs2d = np.ascontiguousarray(runs2d, dtype=np.float32)
+    n_runs, n_ep = runs2d.shape
+    if out is None:
+        out = np.empty((3, n_ep), dtype=np.float64)
+    idx = np.random.default_rng(seed).integers(0, n_runs, size=(int(n_boot), n_runs), dtype=np.int32)
+    if NUMBA_AVAILABLE:
+        _aggregate_kernel(n_runs)(runs2d, idx, float(level), out)
+    else:
+        _aggregate_np(runs2d, idx, float(level), out)
+    return out
@@ -1,69 +1,256 @@
+import queue
+import threading
 import numpy as np
-from typing import List, Tuple, Optional, Any
+import torch
+from typing import Dict, List, Tuple, Optional, Any
 from collections import deque
 
 class ReplayBuffer:
-    def __init__(self, max_size: int, min_size: int = 0):
-        """Initialize replay buffer with specified maximum capacity."""
-        self.buffer = deque(maxlen=max_size)
-        self.max_size = max_size
+    """Fixed-capacity transition store kept as one preallocated array per field (SoA ring)."""
+
+    def __init__(
+        self,
+        max_size: int,
+        min_size: int = 0,
+        obs_shape: Optional[Tuple[int, ...]] = None,
+        action_shape: Optional[Tuple[int, ...]] = None,
+        obs_dtype: Any = np.float32,
+        action_dtype: Any = None,
+        seed: Optional[int] = None,
+    ):
+        """Initialize replay buffer with specified maximum capacity.
+
+        Storage is allocated up front when `obs_shape` is given, otherwise on the
+        first `add` from that transition's shapes/dtypes. Sampling uses its own
+        PCG64 generator, so buffers built with the same `seed` draw the same
+        indices. Without `seed` the generator is seeded with one draw from the
+        global `np.random` state: sampling then depends on (and advances) that
+        state, and is reproducible only if it is seeded, e.g. by `set_global_seed`.
+        """
+        self.max_size = int(max_size)
         self.min_size = int(min_size)
+        self.obs_dtype = obs_dtype
+        self.action_dtype = action_dtype
+        self.position = 0
+        self.size = 0
+        self.obs = None
+        if seed is None:
+            seed = np.random.randint(0, 2**32, dtype=np.uint64)
+        self._rng = np.random.default_rng(seed)
+        # Guards the ring against a Prefetcher thread sampling while `add` writes
+        self._lock = threading.Lock()
+        # Pinned host staging for sample_torch, (re)built per batch size
+        self._stage = None
+        self._stage_np = None
+        self._stage_event = None
+        if obs_shape is not None:
+            self._allocate(tuple(obs_shape), tuple(action_shape or ()), action_dtype or np.int64)
+
+    def _allocate(self, obs_shape, action_shape, action_dtype):
+        n = self.max_size
+        self.obs = np.empty((n,) + obs_shape, dtype=self.obs_dtype)
+        self.next_obs = np.empty((n,) + obs_shape, dtype=self.obs_dtype)
+        self.actions = np.empty((n,) + action_shape, dtype=action_dtype)
+        self.rewards = np.empty(n, dtype=np.float32)
+        self.dones = np.empty(n, dtype=np.bool_)
 
     def add(self, obs: Any, action: Any, reward: float, next_obs: Any, done: bool) -> None:
-        """Add a transition tuple to the replay buffer."""
-        self.buffer.append((obs, action, reward, next_obs, done))
-
-    def sample(self, batch_size: int) -> List[Tuple]:
-        """Randomly sample a batch of transitions from the buffer."""
-        size = len(self.buffer)
-        if size < self.min_size:
-            raise ValueError(f"Buffer size {size} < min_size {self.min_size}")
-        if batch_size > size:
-            raise ValueError(f"Requested batch_size {batch_size} > buffer size {size}")
-        indices = np.random.choice(len(self.buffer), size=batch_size, replace=False)
-        
-        batch = [self.buffer[i] for i in indices]
+        """Add a transition to the replay buffer, overwriting the oldest when full."""
+        with self._lock:
+            if self.obs is None:
+                action = np.asarray(action)
+                self._allocate(np.shape(obs), action.shape, self.action_dtype or action.dtype)
+            i = self.position
+            self.obs[i] = obs
+            self.actions[i] = action
+            self.rewards[i] = reward
+            self.next_obs[i] = next_obs
+            self.dones[i] = done
+            self.position = (i + 1) % self.max_size
+            if self.size < self.max_size:
+                self.size += 1
+
+    def sample(self, batch_size: int) -> Dict[str, np.ndarray]:
+        """Uniformly sample (with replacement) a batch of transitions as contiguous arrays."""
+        if self.size < self.min_size:
+            raise ValueError(f"Buffer size {self.size} < min_size {self.min_size}")
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty buffer")
+        with self._lock:
+            idx = self._rng.integers(0, self.size, size=batch_size, dtype=np.int64)
+            return self._gather(idx)
+
+    def sample_torch(self, batch_size: int, device: Any = "cpu") -> Dict[str, torch.Tensor]:
+        """Sample a batch as tensors on `device`.
+
+        On CPU the gathered arrays are wrapped with `torch.from_numpy` (no copy).
+        Otherwise rows are gathered straight into reused pinned staging tensors and
+        sent with `non_blocking=True`, so the H2D copy overlaps later host work.
+        """
+        device = torch.device(device)
+        if device.type == "cpu":
+            return {k: torch.from_numpy(v) for k, v in self.sample(batch_size).items()}
+        if self.size < self.min_size:
+            raise ValueError(f"Buffer size {self.size} < min_size {self.min_size}")
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty buffer")
+        if self._stage is None or self._stage["rewards"].shape[0] != batch_size:
+            self._allocate_stage(batch_size)
+        elif self._stage_event is not None:
+            # The previous batch's async copies must finish before the staging is overwritten
+            self._stage_event.synchronize()
+
+        with self._lock:
+            idx = self._rng.integers(0, self.size, size=batch_size, dtype=np.int64)
+            for name, src in self._fields().items():
+                # mode="clip" lets take write straight into the pinned view; indices are in range
+                np.take(src, idx, axis=0, out=self._stage_np[name], mode="clip")
+        batch = {k: t.to(device, non_blocking=True) for k, t in self._stage.items()}
+        self._stage_event = torch.cuda.Event()
+        self._stage_event.record()
         return batch
 
+    def _fields(self) -> Dict[str, np.ndarray]:
+        return {
+            "obs": self.obs,
+            "actions": self.actions,
+            "rewards": self.rewards,
+            "next_obs": self.next_obs,
+            "dones": self.dones,
+        }
+
+    def _allocate_stage(self, batch_size):
+        self._stage = {
+            name: torch.from_numpy(np.empty((batch_size,) + arr.shape[1:], dtype=arr.dtype)).pin_memory()
+            for name, arr in self._fields().items()
+        }
+        self._stage_np = {name: t.numpy() for name, t in self._stage.items()}
+        self._stage_event = None
+
+    def _gather(self, idx) -> Dict[str, np.ndarray]:
+        return {
+            "obs": self.obs[idx],
+            "actions": self.actions[idx],
+            "rewards": self.rewards[idx],
+            "next_obs": self.next_obs[idx],
+            "dones": self.dones[idx],
+        }
+
+    def _chronological(self) -> np.ndarray:
+        """Slot indices from oldest to newest."""
+        start = self.position if self.size == self.max_size else 0
+        return (start + np.arange(self.size)) % self.max_size
+
+    def _as_tuples(self, idx) -> List[Tuple]:
+        return [
+            (self.obs[i], self.actions[i], float(self.rewards[i]), self.next_obs[i], bool(self.dones[i]))
+            for i in idx
+        ]
+
     def __len__(self) -> int:
         """Return the current number of transitions in the buffer."""
-        return len(self.buffer)
+        return self.size
     
     def is_full(self) -> bool:
         """Check if buffer has reached maximum capacity."""
-        return len(self.buffer) == self.max_size
+        return self.size == self.max_size
 
     def get_buffer_size(self) -> int:
         """Get current number of stored transitions."""
-        return len(self.buffer)
+        return self.size
 
     def clear(self) -> None:
-        """Clear all stored transitions from buffer."""
-        self.buffer.clear()
+        """Clear all stored transitions from buffer (storage is kept for reuse)."""
+        self.position = 0
+        self.size = 0
 
     def get_recent_transitions(self, n: int) -> List[Tuple]:
         """Get the n most recent transitions added to buffer."""
-        return list(self.buffer)[-n:]
+        return self._as_tuples(self._chronological()[-n:]) if n > 0 else []
 
     def get_all_transitions(self) -> List[Tuple]:
         """Get all stored transitions (useful for saving/loading)."""
-        return list(self.buffer)
+        return self._as_tuples(self._chronological())
     
     def ready(self) -> bool:
-        return len(self.buffer) >= self.min_size
+        return self.size >= self.min_size
+
+class Prefetcher:
+    """Samples `ReplayBuffer.sample_torch` batches on a daemon thread, up to `depth` ahead.
+
+    The learner's `get()` then only dequeues, so sampling and the H2D copy overlap
+    the previous update. A batch may predate transitions added after it was drawn.
+    One prefetcher per buffer: the pinned staging in `sample_torch` is not shared.
+    """
+
+    def __init__(self, buffer: ReplayBuffer, batch_size: int, device: Any = "cpu", depth: int = 2):
+        self.buffer = buffer
+        self.batch_size = int(batch_size)
+        self.device = device
+        self._queue = queue.Queue(maxsize=max(int(depth), 1))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="replay-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                item = self.buffer.sample_torch(self.batch_size, self.device)
+            except Exception as e:
+                # Hand the error to the consumer instead of dying silently
+                item = e
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if isinstance(item, Exception):
+                return
+
+    def serves(self, buffer: ReplayBuffer, device: Any) -> bool:
+        """Whether this prefetcher samples `buffer` onto `device`."""
+        return buffer is self.buffer and torch.device(device) == torch.device(self.device)
+
+    def get(self) -> Dict[str, torch.Tensor]:
+        """Next prefetched batch (blocks until one is ready; re-raises sampling errors)."""
+        item = self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def close(self) -> None:
+        """Stop the sampling thread and drop any queued batches."""
+        self._stop.set()
+        self._thread.join()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
 
 class EpisodeBuffer:
     def __init__(self):
         """Initialize an empty episode buffer."""
         self.buffer = deque()
         self.current_episode = []
+        # Per-episode totals maintained incrementally, parallel to `buffer`
+        self._ep_rewards = []
+        self._ep_lengths = []
+        self._cur_reward = 0.0
 
     def add_step(self, obs: Any, action: Any, reward: float, done: bool) -> None:
         """Add a single step to the current episode."""
         self.current_episode.append((obs, action, reward, done))
-        if done == True:
+        self._cur_reward += reward
+        if done:
             self.buffer.append(self.current_episode)
-            self.current_episode.clear()
+            self._ep_rewards.append(self._cur_reward)
+            self._ep_lengths.append(len(self.current_episode))
+            # Start a new list: the stored episode must not alias the one being filled
+            self.current_episode = []
+            self._cur_reward = 0.0
 
     def get_episode(self) -> Optional[List[Tuple]]:
         """Retrieve the most recently completed episode."""
@@ -75,7 +262,9 @@ class EpisodeBuffer:
     def clear(self) -> None:
         """Remove all stored episodes and clear current episode."""
         self.buffer.clear()
-        self.current_episode.clear()
+        self._ep_rewards.clear()
+        self._ep_lengths.clear()
+        self.reset_current_episode()
 
     def get_all_episodes(self) -> List[List[Tuple]]:
         """Get all completed episodes stored in buffer."""
@@ -87,25 +276,20 @@ class EpisodeBuffer:
 
     def get_latest_episode_length(self) -> int:
         """Get length of the most recent completed episode."""
-        if self.buffer:
-            return len(self.buffer[-1])
+        if self._ep_lengths:
+            return self._ep_lengths[-1]
         else:
             return 0
         
     def get_episode_rewards(self) -> List[float]:
         """Get list of total rewards for all completed episodes."""
-        if self.buffer:
-            return [sum(step[2] for step in episode) for episode in self.buffer]
-        else:
-            return []
+        return list(self._ep_rewards)
         
     def get_episode_lengths(self) -> List[int]:
         """Get list of lengths for all completed episodes."""
-        if self.buffer:
-            return [len(episode) for episode in self.buffer]
-        else:
-            return []
+        return list(self._ep_lengths)
 
     def reset_current_episode(self) -> None:
         """Clear current episode without storing it (useful for failed episodes)."""
-        self.current_episode.clear()
+        self.current_episode = []
+        self._cur_reward = 0.0
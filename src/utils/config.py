@@ -1,5 +1,14 @@
+import copy
 import os
 import yaml
+
+# libyaml-backed loader/dumper when PyYAML was built with it; the pure-Python ones otherwise
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+
 class ConfigManager:
     def __init__(self, base_config_path="configs", load_defaults=True):
         self.base_config_path = base_config_path
@@ -23,6 +32,10 @@ class ConfigManager:
             raise NotADirectoryError(f"Path is not a directory: {self.envs_path}")
         
         self._config_cache = {}
+        # Merged defaults+algo+env configs keyed by (algo_name, env_name)
+        self._full_cache = {}
+        # Config-file listings per directory: path -> (dir mtime_ns, names)
+        self._listing_cache = {}
 
         if load_defaults == True:
             self.defaults = self._load_yaml_file("defaults.yaml")
@@ -31,13 +44,20 @@ class ConfigManager:
 
     def get_full_config(self, algo_name, env_name, cli_overrides=None):
         """Get complete config by merging defaults, algo, and env configs"""
-        defaults = getattr(self, "defaults", {}) or {}
+        key = (algo_name, env_name)
+        merged = self._full_cache.get(key)
+        if merged is None:
+            defaults = getattr(self, "defaults", {}) or {}
 
-        algo_config = self._load_yaml_file(f"{algo_name}.yaml")
-        env_config = self._load_yaml_file(f"{env_name}.yaml")
+            algo_config = self._load_yaml_file(f"{algo_name}.yaml")
+            env_config = self._load_yaml_file(f"{env_name}.yaml")
 
-        merged = self._deep_merge_dicts(defaults, algo_config)
-        merged = self._deep_merge_dicts(merged, env_config)
+            merged = self._deep_merge_dicts(defaults, algo_config)
+            merged = self._deep_merge_dicts(merged, env_config)
+            self._full_cache[key] = merged
+
+        # The merge shares nested dicts with cached files; callers get an independent copy
+        merged = copy.deepcopy(merged)
 
         if cli_overrides and isinstance(cli_overrides, dict):
             merged = self._deep_merge_dicts(merged, cli_overrides)
@@ -47,21 +67,26 @@ class ConfigManager:
     def save_config(self, config, filepath):
         """Save a config to a YAML file"""
         with open(filepath, 'w') as f:
-            yaml.safe_dump(config, f)
+            yaml.dump(config, f, Dumper=YamlDumper)
 
     def list_available_algorithms(self):
         """Return list of available algorithm config files"""
-        files = os.listdir(self.algo_path)
-
-        yaml_files = [f for f in files if f.endswith((".yaml", ".yml"))]
-        return yaml_files
+        return self._list_config_files(self.algo_path)
 
     def list_available_environments(self):
         """Return list of available environment config files"""
-        files = os.listdir(self.envs_path)
-
-        yaml_files = [f for f in files if f.endswith((".yaml", ".yml"))]
-        return yaml_files
+        return self._list_config_files(self.envs_path)
+
+    def _list_config_files(self, directory):
+        """YAML file names in `directory`, rescanned only when the directory's mtime changes."""
+        mtime = os.stat(directory).st_mtime_ns
+        cached = self._listing_cache.get(directory)
+        if cached is None or cached[0] != mtime:
+            with os.scandir(directory) as entries:
+                names = [e.name for e in entries if self._is_config_file(e.name)]
+            cached = (mtime, names)
+            self._listing_cache[directory] = cached
+        return list(cached[1])
 
     def reload_configs(self):
         """Clear cache and reload all configs"""
@@ -86,6 +111,8 @@ class ConfigManager:
     def clear_cache(self):
         """Clear the config cache"""
         self._config_cache.clear()
+        self._full_cache.clear()
+        self._listing_cache.clear()
 
     def _load_yaml_file(self, filename):
         """Load a YAML file from the config directory"""
@@ -98,7 +125,7 @@ class ConfigManager:
         path = self._get_file_path(self.base_config_path, filename)
         
         with open(path, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
         
             # Validate directly here (not calling separate method)
         if data is None:
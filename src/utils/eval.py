@@ -1,4 +1,71 @@
-from typing import Any
+import weakref
+from typing import Any, Callable, Dict, List
+
+
+def _sub_envs(env: Any):
+    """Sub-environments of an in-process vector env (e.g. SyncVectorEnv), else None."""
+    envs = getattr(env, "envs", None)
+    return envs if isinstance(envs, (list, tuple)) else None
+
+
+def _is_worker_vector_env(env: Any) -> bool:
+    """True for vector envs whose sub-envs live in worker processes (AsyncVectorEnv)."""
+    return hasattr(env, "num_envs") and hasattr(env, "call") and _sub_envs(env) is None
+
+
+# Per-env bound methods found by walking the wrapper chain, keyed weakly by the outer env.
+# Chains are fixed once the factory has built them, so each (env, method) is walked once.
+_CHAIN_CACHE: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _chain_methods(env: Any, name: str) -> List[Callable]:
+    """Bound `name` methods of every wrapper in `env`'s `.env` chain, outermost first."""
+    outer = getattr(env, name, None)
+    head = [outer] if callable(outer) else []
+    try:
+        per_env = _CHAIN_CACHE.setdefault(env, {})
+    except TypeError:
+        # Not weak-referenceable; walk every time
+        per_env = {}
+    methods = per_env.get(name)
+    if methods is None:
+        # Only inner wrappers are cached: a bound method of `env` itself would keep the weak key alive
+        methods = []
+        current = getattr(env, "env", None)
+        visited_ids = {id(env)}
+        while current is not None and id(current) not in visited_ids:
+            visited_ids.add(id(current))
+            method = getattr(current, name, None)
+            if callable(method):
+                methods.append(method)
+            # Descend into the next wrapper/base env if present
+            current = getattr(current, "env", None)
+        per_env[name] = methods
+    return head + methods
+
+
+def _workers_have(env: Any, name: str) -> bool:
+    """Whether every worker env's wrapper chain exposes `name` (probed once per vector env).
+
+    `VectorEnv.call` resolves names with `get_wrapper_attr`, which raises in the worker
+    when no wrapper defines them (e.g. no BaseWrapper in the chain).
+    """
+    try:
+        per_env = _CHAIN_CACHE.setdefault(env, {})
+    except TypeError:
+        per_env = {}
+    key = f"worker:{name}"
+    found = per_env.get(key)
+    if found is None:
+        found = per_env[key] = all(env.call("has_wrapper_attr", name))
+    return found
+
+
+def forget_env(env: Any) -> None:
+    """Drop cached wrapper-chain lookups for `env` (e.g. after it is closed)."""
+    _CHAIN_CACHE.pop(env, None)
+    for sub in _sub_envs(env) or ():
+        forget_env(sub)
 
 
 def set_env_training_mode(env: Any, training: bool) -> None:
@@ -7,23 +74,40 @@ def set_env_training_mode(env: Any, training: bool) -> None:
     wrapper that exposes `set_training(bool)`, set its training mode.
 
     This is useful to freeze running statistics (e.g., normalization wrappers)
-    during evaluation and re-enable them during training.
+    during evaluation and re-enable them during training. The capable wrappers
+    are resolved once per env and cached.
     """
-    current = env
-    visited_ids = set()
-
-    while current is not None and id(current) not in visited_ids:
-        visited_ids.add(id(current))
+    sub_envs = _sub_envs(env)
+    if sub_envs is not None:
+        for sub in sub_envs:
+            set_env_training_mode(sub, training)
+        return
+    if _is_worker_vector_env(env):
+        # Each worker walks its own chain via BaseWrapper.set_chain_training
+        if _workers_have(env, "set_chain_training"):
+            env.call("set_chain_training", bool(training))
+        return
 
-        if hasattr(current, "set_training"):
-            try:
-                current.set_training(bool(training))
-            except Exception:
-                # Ignore wrappers that define set_training but raise
-                # due to unexpected internal state; continue descending
-                pass
+    training = bool(training)
+    for set_training in _chain_methods(env, "set_training"):
+        set_training(training)
 
-        # Descend into the next wrapper/base env if present
-        current = getattr(current, "env", None)
 
+def flush_env_stats(env: Any) -> None:
+    """
+    Walk the wrapper chain and call `flush_stats()` on wrappers that defer
+    running-stat updates (e.g. NormalizeObservations with `deferred_stats`),
+    merging everything buffered since the last flush in one batch.
+    """
+    sub_envs = _sub_envs(env)
+    if sub_envs is not None:
+        for sub in sub_envs:
+            flush_env_stats(sub)
+        return
+    if _is_worker_vector_env(env):
+        if _workers_have(env, "flush_chain_stats"):
+            env.call("flush_chain_stats")
+        return
 
+    for flush in _chain_methods(env, "flush_stats"):
+        flush()
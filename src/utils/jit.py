@@ -0,0 +1,23 @@
+"""Optional Numba JIT support.
+
+`njit` compiles with Numba when it is installed and otherwise returns the
+function unchanged, so kernels stay importable and correct without it;
+`prange` likewise falls back to the builtin `range`.
+"""
+
+try:
+    from numba import njit as _numba_njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    prange = range
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """Drop-in for `numba.njit` that degrades to a no-op decorator."""
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
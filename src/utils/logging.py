@@ -1,19 +1,64 @@
 import json
 import os
-from datetime import datetime
+import random
+import time
 from typing import Dict, Any, Optional
 
+import numpy as np
+
+# orjson is optional: ~10x faster and serializes numpy natively; stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _to_builtin(obj: Any) -> Any:
+    """`json` fallback encoder for numpy values."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Compact JSON bytes (no indentation)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":"), default=_to_builtin).encode()
+
+
 class Logger:
-    def __init__(self, log_dir: str = "logs", experiment_name: Optional[str] = None):
-        """Initialize logger with directory and experiment name."""
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        experiment_name: Optional[str] = None,
+        step_log_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """Initialize logger with directory and experiment name.
+
+        Step records are streamed as ND-JSON to `<log_dir>/<name>_steps.jsonl`
+        instead of being held in memory; episodes and metrics go to `save_logs`.
+        Only a `step_log_rate` fraction of steps is logged (0 disables step logging),
+        drawn from the logger's own `random.Random(seed)` so sampling neither
+        consumes nor depends on the global `random` stream.
+        Observations are appended as raw float32 to `<name>_steps.obs.bin`; each
+        JSON line holds its `obs_offset` (in elements) and `obs_shape`.
+        """
         self.dir = log_dir
         self.exp_name = experiment_name
+        self.step_log_rate = float(step_log_rate)
+        self._rng = random.Random(seed)
+        self._obs_fp = None
+        self._obs_offset = 0
         self.logs = {
             "episodes": [],
-            "steps": [],
             "metrics": []
         }
-    
+        self._step_fp = None
+
     def log_episode(self, episode: int, reward: float, length: int, loss: Optional[float] = None):
         """Log episode-level metrics."""
         entry = self._create_log_entry({
@@ -23,30 +68,64 @@ class Logger:
             "loss": loss
         })
         self.logs["episodes"].append(entry)
-        
-    
+
+
     def log_step(self, step: int, obs: Any, action: Any, reward: float, done: bool):
-        """Log step-level data."""
+        """Log step-level data as one ND-JSON line (sampled at `step_log_rate`)."""
+        rate = self.step_log_rate
+        if rate <= 0.0 or (rate < 1.0 and self._rng.random() >= rate):
+            return
+        if self._step_fp is None:
+            os.makedirs(self.dir, exist_ok=True)
+            self._step_fp = open(self.steps_path, "ab", buffering=1024 * 1024)
+            self._obs_fp = open(self.obs_path, "ab", buffering=1024 * 1024)
+            self._obs_offset = os.path.getsize(self.obs_path) // 4
+        # Serialize the observation immediately: a copy the env can't mutate afterwards
+        obs = np.asarray(obs, dtype=np.float32)
+        self._obs_fp.write(obs.tobytes())
         entry = self._create_log_entry({
             "step": step,
-            "observation": obs,
+            "obs_offset": self._obs_offset,
+            "obs_shape": obs.shape,
             "action": action,
             "reward": reward,
             "done": done
         })
-        self.logs["steps"].append(entry)
-    
+        self._obs_offset += obs.size
+        self._step_fp.write(_dumps(entry) + b"\n")
+
+    @property
+    def steps_path(self) -> str:
+        """ND-JSON file that step records are appended to."""
+        return os.path.join(self.dir, f"{self.exp_name or 'experiment'}_steps.jsonl")
+
+    @property
+    def obs_path(self) -> str:
+        """Flat float32 file holding logged observations (see `obs_offset`/`obs_shape`)."""
+        return os.path.join(self.dir, f"{self.exp_name or 'experiment'}_steps.obs.bin")
+
     def save_logs(self, path: Optional[str] = None):
-        """Save all logged data to file."""
+        """Save episode/metric logs to file and flush streamed step records."""
         if path is None:
             path = os.path.join(self.dir, f"{self.exp_name or 'experiment'}_logs.json")
-    
+
+        if self._step_fp is not None:
+            self._obs_fp.flush()
+            self._step_fp.flush()
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w') as f:
-            json.dump(self.logs, f, indent=2)
-    
+        with open(path, 'wb') as f:
+            f.write(_dumps({**self.logs, "steps_file": self.steps_path, "obs_file": self.obs_path}))
+
+    def close(self):
+        """Flush and close the step log."""
+        if self._step_fp is not None:
+            self._obs_fp.close()
+            self._step_fp.close()
+            self._obs_fp = None
+            self._step_fp = None
+
     def _create_log_entry(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a log entry with timestamp."""
+        """Create a log entry with timestamp (ns since the epoch)."""
         entry = data.copy()
-        entry["timestamp"] = datetime.now().isoformat()
-        return entry
\ No newline at end of file
+        entry["timestamp"] = time.time_ns()
+        return entry
@@ -1,13 +1,116 @@
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from collections import deque
+
+class RingBuffer:
+    """Fixed-capacity FIFO of scalars backed by a preallocated numpy array."""
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._data = np.empty(self.capacity, dtype=dtype)
+        self._head = 0  # next write position
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._extrema = None  # cached (min, max), dropped on every write
+
+    def append(self, value: float) -> None:
+        """Store a value, overwriting the oldest one when full."""
+        value = float(value)
+        if self._count == self.capacity:
+            evicted = float(self._data[self._head])
+            self._sum -= evicted
+            self._sumsq -= evicted * evicted
+        else:
+            self._count += 1
+        self._data[self._head] = value
+        self._extrema = None
+        self._sum += value
+        self._sumsq += value * value
+        self._head = (self._head + 1) % self.capacity
+        if self._head == 0:
+            # Resync once per lap so incremental sums don't drift
+            self._resync_sums()
+
+    @property
+    def mean(self) -> float:
+        """Mean of stored values in O(1)."""
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of stored values in O(1)."""
+        if not self._count:
+            return 0.0
+        mean = self._sum / self._count
+        return float(np.sqrt(max(self._sumsq / self._count - mean * mean, 0.0)))
+
+    @property
+    def min(self) -> float:
+        """Smallest stored value (computed lazily, cached until the next write)."""
+        return self._min_max()[0]
+
+    @property
+    def max(self) -> float:
+        """Largest stored value (computed lazily, cached until the next write)."""
+        return self._min_max()[1]
+
+    def _min_max(self) -> Tuple[float, float]:
+        if self._extrema is None:
+            if not self._count:
+                return 0.0, 0.0
+            # Order doesn't matter for extrema, so scan the live slots in place (no concatenate)
+            live = self._data[:self._count]
+            self._extrema = (float(live.min()), float(live.max()))
+        return self._extrema
+
+    def values(self) -> np.ndarray:
+        """Return stored values oldest-first (a view until the buffer wraps)."""
+        if self._count < self.capacity:
+            return self._data[:self._count]
+        return np.concatenate((self._data[self._head:], self._data[:self._head]))
+
+    def tobytes(self) -> bytes:
+        """Raw oldest-first buffer contents for serialization."""
+        return self.values().tobytes()
+
+    def load(self, values) -> None:
+        """Replace contents with `values` (oldest-first; raw bytes or a sequence) in a single copy."""
+        if isinstance(values, (bytes, bytearray)):
+            arr = np.frombuffer(values, dtype=self._data.dtype)
+        else:
+            arr = np.asarray(values, dtype=self._data.dtype)
+        arr = arr[-self.capacity:]
+        n = arr.shape[0]
+        self._data[:n] = arr
+        self._count = n
+        self._head = n % self.capacity
+        self._extrema = None
+        self._resync_sums()
+
+    def clear(self) -> None:
+        """Drop all stored values without reallocating."""
+        self._head = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._extrema = None
+
+    def _resync_sums(self) -> None:
+        live = self._data[:self._count]
+        self._sum = float(live.sum())
+        self._sumsq = float(np.dot(live, live))
+
+    def __len__(self) -> int:
+        return self._count
+
 
 class MetricsTracker:
     def __init__(self, window_size: int = 100):
         """Initialize metrics tracker with sliding window."""
-        self.rewards = deque(maxlen=window_size)
-        self.lengths = deque(maxlen=window_size)
-        self.losses = deque(maxlen=window_size)
+        self.window_size = int(window_size)
+        self.rewards = RingBuffer(window_size)
+        self.lengths = RingBuffer(window_size)
+        self.losses = RingBuffer(window_size)
         
         self.total_episodes = 0
         self.total_steps = 0
@@ -17,7 +120,7 @@ class MetricsTracker:
         """Update metrics with new episode data."""
         self.rewards.append(episode_reward)
         self.lengths.append(episode_length)
-        if loss: 
+        if loss is not None:
             self.losses.append(loss)
         self.total_episodes += 1
         self.total_steps += episode_length
@@ -47,15 +150,14 @@ class MetricsTracker:
         self.total_steps = 0
         self.total_reward = 0
     
-    def _calculate_stats(self, data: List[float]) -> Dict[str, float]:
-        """Calculate statistics for a list of values."""
-        if not data:
+    def _calculate_stats(self, buf: RingBuffer) -> Dict[str, float]:
+        """Calculate statistics for a window without materializing it."""
+        if not buf:
             return {"mean": 0.0, "std": 0.0, "min": 0.0, "max": 0.0}
         
-        arr = np.array(data)
         return {
-            "mean": float(np.mean(arr)),
-            "std": float(np.std(arr)),
-            "min": float(np.min(arr)),
-            "max": float(np.max(arr))
+            "mean": float(buf.mean),
+            "std": buf.std,
+            "min": buf.min,
+            "max": buf.max
         }
\ No newline at end of file
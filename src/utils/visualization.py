@@ -1,13 +1,381 @@
 """Visualization utilities for experiments.
 
-Defines a `Plotter` class with method stubs for common experiment plots.
-Implementations are intentionally omitted here; this serves as the public API.
+Defines a `Plotter` class for common experiment plots. Figures are built with
+the object-oriented matplotlib API (no pyplot global state) and kept on the
+plotter until `save_plots`. Every figure is attached to an Agg canvas up front,
+whatever the interactive backend, so saving never switches canvases.
+
+`Plotter(background=True)` draws in a spawned worker process instead, so a
+training loop never blocks on matplotlib. `Plotter(backend="pyqtgraph")` shows
+learning curves in a live Qt window updated in place (see `append_points`).
 """
 
 from __future__ import annotations
 
+import csv
+import hashlib
+import io
+import json
+import multiprocessing as mp
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+import matplotlib as mpl
+import numpy as np
+from matplotlib import colors as mpl_colors
+from matplotlib import image as mpl_image
+from matplotlib import style as mpl_style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from ._stats_kernels import aggregate, rolling_mean_std
+from .jit import njit, NUMBA_AVAILABLE
+
+# datashader is optional: it rasterizes dense run curves in plot_algorithm_comparison
+try:
+    import datashader as ds
+    import datashader.transfer_functions as ds_tf
+    import pandas as pd
+except ImportError:
+    ds = None
+
+# xxhash is optional: a faster content hash for the aggregation cache; blake2b otherwise
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# blosc2 is optional: zstd-compresses cached M4 series; they are kept uncompressed otherwise
+try:
+    import blosc2
+except ImportError:
+    blosc2 = None
+
+# pyarrow is optional: multithreaded C++ parsing of run logs, cached as Parquet by `load_results`
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Below this many curve points matplotlib is fast enough and datashader isn't used
+DATASHADER_MIN_POINTS = 50_000
+
+# Resamples behind every bootstrap confidence interval
+N_BOOTSTRAP = 1000
+
+# Aggregates (mean + CI) kept per Plotter, keyed by run-data content
+AGG_CACHE_SIZE = 128
+
+# Per-episode fields read from Logger run logs (`<name>_logs.json`)
+RUN_COLUMNS = ("reward", "length", "loss")
+
+# Default location of the Parquet cache of parsed run logs
+RESULTS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "rl-learning")
+
+# Byte budget of the per-Plotter cache of downsampled (M4) learning curves
+M4_CACHE_BYTES = 64 << 20
+
+# Lines with more points than this are rasterized in vector exports (axes/text stay vector)
+RASTERIZE_MIN_POINTS = 10_000
+
+# Path simplification and chunked Agg drawing for dense curves, applied by Plotter()
+RC_PARAMS = {
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10_000,
+}
+
+# Arrays at least this large reach the background worker via shared memory, not the pipe
+SHM_MIN_BYTES = 1 << 16
+
+
+@njit(cache=True)
+def _m4_indices_jit(x, y, width):
+    n = x.shape[0]
+    x0 = x[0]
+    scale = width / (x[n - 1] - x0) if x[n - 1] > x0 else 0.0
+    out = np.empty(4 * min(n, width), dtype=np.int64)
+    k = 0
+    cur = -1
+    first = lo = hi = 0
+    for i in range(n):
+        b = min(int((x[i] - x0) * scale), width - 1)
+        if b != cur:
+            if cur >= 0:
+                out[k] = first
+                out[k + 1] = min(lo, hi)
+                out[k + 2] = max(lo, hi)
+                out[k + 3] = i - 1
+                k += 4
+            cur = b
+            first = lo = hi = i
+        elif y[i] < y[lo]:
+            lo = i
+        elif y[i] > y[hi]:
+            hi = i
+    out[k] = first
+    out[k + 1] = min(lo, hi)
+    out[k + 2] = max(lo, hi)
+    out[k + 3] = n - 1
+    return out[:k + 4]
+
+
+def _m4_indices_np(x, y, width):
+    n = x.shape[0]
+    span = float(x[-1] - x[0])
+    scale = width / span if span > 0 else 0.0
+    bins = np.minimum(((x - x[0]) * scale).astype(np.int64), width - 1)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    counts = ends - starts + 1
+    # First index in each bin where y hits the bin's min / max
+    group = np.repeat(np.arange(starts.size), counts)
+    lo_hit = np.flatnonzero(y == np.repeat(np.minimum.reduceat(y, starts), counts))
+    hi_hit = np.flatnonzero(y == np.repeat(np.maximum.reduceat(y, starts), counts))
+    lo = lo_hit[np.unique(group[lo_hit], return_index=True)[1]]
+    hi = hi_hit[np.unique(group[hi_hit], return_index=True)[1]]
+    return np.stack([starts, np.minimum(lo, hi), np.maximum(lo, hi), ends], axis=1).ravel()
+
+
+_m4_indices = _m4_indices_jit if NUMBA_AVAILABLE else _m4_indices_np
+
+
+def _m4_downsample(x: np.ndarray, y: np.ndarray, width: int) -> np.ndarray:
+    """M4 aggregation: indices of the first, min, max and last point per pixel column.
+
+    `x` must be increasing. The returned (sorted) indices draw a polyline that
+    rasterizes identically to the full series at `width` pixels.
+    """
+    return _m4_indices(np.ascontiguousarray(x, dtype=np.float64), np.ascontiguousarray(y), int(width))
+
+
+def _compress(raw: bytes) -> bytes:
+    if blosc2 is None:
+        return raw
+    return blosc2.compress2(raw, codec=blosc2.Codec.ZSTD, clevel=3, typesize=4)
+
+
+def _decompress(blob: bytes) -> bytes:
+    if blosc2 is None:
+        return blob
+    return blosc2.decompress2(blob)
+
+
+def _digest(arr: np.ndarray) -> bytes:
+    """Content hash of a contiguous array's bytes."""
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(arr)
+    return hashlib.blake2b(arr, digest_size=16).digest()
+
+
+def _runs_array(values: Iterable[Any]) -> np.ndarray:
+    """Stack per-run values into a C-contiguous (n_runs, n_episodes) float32 array.
+
+    A scalar per run gives one column; shorter runs are NaN-padded to the longest.
+    """
+    runs = [np.atleast_1d(np.asarray(v, dtype=np.float32)) for v in values]
+    out = np.full((len(runs), max(run.size for run in runs)), np.nan, dtype=np.float32)
+    for row, run in zip(out, runs):
+        row[:run.size] = run
+    return out
+
+
+def _read_arrow_columns(path: str) -> Dict[str, Any]:
+    """Columns of a run log as Arrow arrays, parsed by pyarrow's multithreaded readers."""
+    if path.endswith(".csv"):
+        table = pa_csv.read_csv(path, read_options=pa_csv.ReadOptions(use_threads=True))
+        return {name: table.column(name) for name in table.column_names}
+    # A Logger log is one compact JSON object, so a single block must hold the whole file
+    opts = pa_json.ReadOptions(use_threads=True, block_size=max(os.path.getsize(path) + 1, 1 << 20))
+    episodes = pa_json.read_json(path, read_options=opts).column("episodes").combine_chunks().flatten()
+    if not pa.types.is_struct(episodes.type):
+        return {}
+    return {episodes.type.field(i).name: episodes.field(i) for i in range(episodes.type.num_fields)}
+
+
+def _parse_run_log(path: str) -> Dict[str, np.ndarray]:
+    """Per-episode float32 columns from a run log (missing values become NaN).
+
+    Accepts a Logger JSON log (`<name>_logs.json`) or a CSV with RUN_COLUMNS headers.
+    """
+    if pa is not None:
+        columns = _read_arrow_columns(path)
+        n = len(next(iter(columns.values()))) if columns else 0
+        return {
+            col: (columns[col].cast(pa.float32()).to_numpy(zero_copy_only=False)
+                  if col in columns else np.full(n, np.nan, dtype=np.float32))
+            for col in RUN_COLUMNS
+        }
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            episodes = list(csv.DictReader(f))
+    else:
+        with open(path, "rb") as f:
+            episodes = json.load(f)["episodes"]
+    return {
+        col: np.array([np.nan if ep.get(col) in (None, "") else float(ep[col]) for ep in episodes], dtype=np.float32)
+        for col in RUN_COLUMNS
+    }
+
+
+def _load_run(path: str, cache_dir: str) -> Dict[str, np.ndarray]:
+    """`_parse_run_log`, served from a Parquet cache keyed by the file's (path, mtime, size)."""
+    if pa is None:
+        return _parse_run_log(path)
+    st = os.stat(path)
+    fingerprint = f"{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}".encode()
+    cached = os.path.join(cache_dir, hashlib.blake2b(fingerprint, digest_size=16).hexdigest() + ".parquet")
+    if os.path.exists(cached):
+        table = pq.ParquetFile(cached, memory_map=True).read()
+        return {col: table.column(col).to_numpy() for col in RUN_COLUMNS}
+    run = _parse_run_log(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    pq.write_table(pa.table(run), tmp, compression="zstd", use_dictionary=True)
+    os.replace(tmp, cached)
+    return run
+
+
+def _axis_values(keys: Sequence[Any]) -> Tuple[np.ndarray, bool]:
+    """Numeric positions for hyperparameter values, or 0..n-1 when they aren't all numbers."""
+    try:
+        return np.array([float(k) for k in keys]), True
+    except (TypeError, ValueError):
+        return np.arange(len(keys), dtype=np.float64), False
+
+
+def _cell_edges(centers: np.ndarray) -> np.ndarray:
+    """Edges of cells around sorted `centers` (midpoints, ends mirrored outward)."""
+    if centers.size == 1:
+        return np.array([centers[0] - 0.5, centers[0] + 0.5])
+    mid = (centers[1:] + centers[:-1]) / 2
+    return np.concatenate(([2 * centers[0] - mid[0]], mid, [2 * centers[-1] - mid[-1]]))
+
+
+def _shade_runs(ax: Any, curves: Mapping[str, np.ndarray], colors: Sequence[str],
+                width: int = 800, height: int = 400) -> None:
+    """Rasterize every run curve with datashader and draw the result as one image on `ax`."""
+    names = list(curves)
+    xs, ys, labels = [], [], []
+    for code, data in enumerate(curves.values()):
+        n_runs, n_ep = data.shape
+        # A NaN column ends each run's line so runs are not joined to each other
+        xs.append(np.tile(np.arange(1, n_ep + 2, dtype=np.float32), n_runs))
+        ys.append(np.hstack((data, np.full((n_runs, 1), np.nan, dtype=np.float32))).ravel())
+        labels.append(np.full(n_runs * (n_ep + 1), code, dtype=np.int32))
+    x, y = np.concatenate(xs), np.concatenate(ys)
+    df = pd.DataFrame({
+        "episode": x,
+        "value": y,
+        "algo": pd.Categorical.from_codes(np.concatenate(labels), categories=names),
+    })
+    x_range = (1.0, float(np.nanmax(x)))
+    y_range = (float(np.nanmin(y)), float(np.nanmax(y)))
+    if y_range[0] == y_range[1]:
+        y_range = (y_range[0] - 0.5, y_range[1] + 0.5)
+    cvs = ds.Canvas(plot_width=width, plot_height=height, x_range=x_range, y_range=y_range)
+    agg = cvs.line(df, "episode", "value", agg=ds.count_cat("algo"))
+    img = ds_tf.shade(agg, color_key=dict(zip(names, colors)))
+    # to_pil() flips rows so the top row is the largest value
+    ax.imshow(np.asarray(img.to_pil()), extent=(*x_range, *y_range), origin="upper",
+              aspect="auto", interpolation="nearest")
+
+
+class _GrowableSeries:
+    """Append-only float32 (x, y) storage, over-allocated 4x so appends are O(1) amortized."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.x = np.empty(capacity, dtype=np.float32)
+        self.y = np.empty(capacity, dtype=np.float32)
+        self.size = 0
+
+    def extend(self, x: np.ndarray, y: np.ndarray) -> None:
+        end = self.size + len(y)
+        if end > self.x.shape[0]:
+            for attr in ("x", "y"):
+                grown = np.empty(4 * end, dtype=np.float32)
+                grown[:self.size] = getattr(self, attr)[:self.size]
+                setattr(self, attr, grown)
+        self.x[self.size:end] = x
+        self.y[self.size:end] = y
+        self.size = end
+
+    def replace(self, x: np.ndarray, y: np.ndarray) -> None:
+        self.size = 0
+        self.extend(x, y)
+
+
+class _SharedArray:
+    """Picklable handle to an array copied into a named shared-memory block."""
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name: str, shape: Tuple[int, ...], dtype: str) -> None:
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _share(obj: Any) -> Any:
+    """Replace large arrays inside `obj` (dicts/lists/tuples) with `_SharedArray` handles."""
+    if isinstance(obj, np.ndarray) and obj.nbytes >= SHM_MIN_BYTES:
+        shm = shared_memory.SharedMemory(create=True, size=obj.nbytes)
+        np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf)[...] = obj
+        handle = _SharedArray(shm.name, obj.shape, obj.dtype.str)
+        # The block outlives this mapping; the worker unlinks it once copied out
+        shm.close()
+        return handle
+    if isinstance(obj, Mapping):
+        return {k: _share(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_share(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_share(v) for v in obj)
+    return obj
+
+
+def _unshare(obj: Any) -> Any:
+    """Inverse of `_share`: copy shared blocks into local arrays and release them."""
+    if isinstance(obj, _SharedArray):
+        shm = shared_memory.SharedMemory(name=obj.name)
+        try:
+            view = np.ndarray(obj.shape, dtype=obj.dtype, buffer=shm.buf)
+            out = view.copy()
+            del view
+        finally:
+            shm.close()
+            shm.unlink()
+        return out
+    if isinstance(obj, dict):
+        return {k: _unshare(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_unshare(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_unshare(v) for v in obj)
+    return obj
+
+
+def _draw_loop(tasks: Any, errors: Any, style: Optional[str]) -> None:
+    """Background worker: replay `(method, args, kwargs)` tasks on a local Plotter until `None`."""
+    plotter = Plotter(style)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        kind, args, kwargs = task
+        try:
+            getattr(plotter, kind)(*_unshare(args), **_unshare(kwargs))
+        except Exception as e:
+            errors.put(f"{kind}: {e!r}")
+
 
 class Plotter:
     """High-level plotting interface for experiment results.
@@ -19,12 +387,62 @@ class Plotter:
     - Save figures to disk using consistent naming and formats.
     """
 
-    def __init__(self, style: Optional[str] = None) -> None:
+    def __init__(self, style: Optional[str] = None, background: bool = False, backend: str = "matplotlib") -> None:
         """Initialize the plotter.
 
         - style: Optional plotting style/preset name to apply globally.
+        - background: draw in a worker process; plot calls only enqueue their
+          inputs and `save_plots` waits for the worker (figures stay in the worker,
+          so `figure_rgba`/`figure_png` are unavailable)
+        - backend: "matplotlib", or "pyqtgraph" to draw learning curves in a live
+          Qt window (comparison/sensitivity plots still use matplotlib)
         """
-        raise NotImplementedError
+        if backend not in ("matplotlib", "pyqtgraph"):
+            raise ValueError(f"Unsupported backend: {backend}")
+        if backend == "pyqtgraph" and background:
+            raise ValueError("backend='pyqtgraph' draws in this process; it can't be combined with background=True")
+        if not background:
+            if style is not None:
+                mpl_style.use(style)
+            mpl.rcParams.update(RC_PARAMS)
+        self.style = style
+        self.background = background
+        self._tasks = None
+        self._errors = None
+        self._worker = None
+        # Prepared figures by name, written out by `save_plots`
+        self._figures: Dict[str, Figure] = {}
+        # LRU of (mean, lo, hi) keyed by (data digest, shape, confidence level)
+        self._agg_cache: "OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray, np.ndarray]]" = OrderedDict()
+        # Aggregation runs on worker threads; only the cache bookkeeping is serialized
+        self._agg_lock = threading.Lock()
+        # Live Qt plots: one panel per metric, one PlotDataItem per (metric, label)
+        self._pg = None
+        self._panels: Dict[str, Any] = {}
+        self._curves: Dict[Tuple[str, Optional[str]], Tuple[Any, _GrowableSeries]] = {}
+        # Reused learning-curve axes per figure name (with their series layout) and
+        # (line, band) artists per (figure name, series), updated in place on re-plot
+        self._curve_axes: Dict[str, Tuple[Tuple[str, ...], Any]] = {}
+        self._lines: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        # Categorical palette resolved once; algorithms keep their color across figures
+        self._lut = [tuple(rgba) for rgba in mpl.colormaps["tab10"](np.arange(10))]
+        self._lut_hex = [mpl_colors.to_hex(rgba) for rgba in self._lut]
+        self._algo_colors: Dict[str, int] = {}
+        # Heatmap color scales reused across images with the same value range
+        self._norms: Dict[Tuple[float, float], mpl_colors.Normalize] = {}
+        # Byte-bounded LRU of compressed (x, mean, std) M4 series keyed by (data digest, window, width)
+        self._m4_cache: "OrderedDict[Tuple[bytes, int, int], bytes]" = OrderedDict()
+        self._m4_cache_bytes = 0
+        # Open per-run memmaps by path, with the (mtime_ns, size) they were opened at
+        self._mmaps: Dict[str, Tuple[Tuple[int, int], np.memmap]] = {}
+        if backend == "pyqtgraph":
+            import pyqtgraph as pg
+            import pyqtgraph.exporters  # noqa: F401  (registers pg.exporters for save_plots)
+
+            pg.setConfigOptions(antialias=False, useOpenGL=True)
+            self._qt_app = pg.mkQApp()
+            self._layout = pg.GraphicsLayoutWidget(show=True)
+            self._pg = pg
 
     def plot_learning_curves(
         self,
@@ -34,27 +452,130 @@ class Plotter:
         smoothing_window: int = 1,
         show_std: bool = False,
         label: Optional[str] = None,
+        force: bool = False,
     ) -> None:
         """Plot learning curves for a single run.
 
         Inputs are episode-wise sequences. If multiple runs are desired,
         aggregate externally and call this method per aggregated series.
+        Smoothed points are plotted at the last episode of their window.
+        Re-plotting the same label and series updates the existing figure's lines
+        in place; `force=True` builds a new figure instead.
         """
-        raise NotImplementedError
+        if self.background:
+            return self._submit("plot_learning_curves", rewards, losses, lengths,
+                                smoothing_window=smoothing_window, show_std=show_std, label=label, force=force)
+        series = [
+            (name, np.asarray(values, dtype=np.float32))
+            for name, values in (("reward", rewards), ("loss", losses), ("length", lengths))
+            if values is not None and len(values)
+        ]
+        if not series:
+            raise ValueError("plot_learning_curves needs at least one non-empty series")
+
+        if self._pg is not None:
+            for name, y in series:
+                window = min(max(int(smoothing_window), 1), y.shape[0])
+                mean, _ = rolling_mean_std(y, window)
+                curve, data = self._live_curve(name, label)
+                data.replace(np.arange(window, y.shape[0] + 1), mean)
+                curve.setData(x=data.x[:data.size], y=data.y[:data.size])
+            self._qt_app.processEvents()
+            return
+
+        fig_name = f"learning_curves_{label}" if label else "learning_curves"
+        layout = tuple(name for name, _ in series)
+        cached = None if force else self._curve_axes.get(fig_name)
+        fresh = cached is None or cached[0] != layout
+        if fresh:
+            fig = self._new_figure((8, 2.5 * len(series)))
+            axes = fig.subplots(len(series), 1, sharex=True, squeeze=False)[:, 0]
+            self._curve_axes[fig_name] = (layout, axes)
+            for key in [k for k in self._lines if k[0] == fig_name]:
+                del self._lines[key]
+        else:
+            axes = cached[1]
+            fig = axes[0].figure
+        width_px = int(fig.get_figwidth() * fig.dpi)
+        for ax, (name, y) in zip(axes, series):
+            window = min(max(int(smoothing_window), 1), y.shape[0])
+            if y.shape[0] - window + 1 > 4 * width_px:
+                x, mean, std = self._m4_series(y, window, width_px)
+            else:
+                mean, std = rolling_mean_std(y, window)
+                x = np.arange(window, y.shape[0] + 1)
+            band = (mean - std, mean + std) if show_std and window > 1 else None
+            self._set_curve(ax, (fig_name, name), x, mean, band, label, x.shape[0] > RASTERIZE_MIN_POINTS)
+            if fresh:
+                ax.set_ylabel(name)
+        if fresh:
+            axes[-1].set_xlabel("episode")
+            if label:
+                axes[0].legend()
+        self._figures[fig_name] = fig
 
     def plot_algorithm_comparison(
         self,
         results: Mapping[str, Mapping[str, Sequence[float]]],
         metric: str = "final_performance",
         confidence_level: float = 0.95,
+        backend: str = "matplotlib",
     ) -> None:
         """Compare algorithms across runs.
 
         - results: maps algorithm name → { metric_name → sequence per run or aggregate }
         - metric: which metric to compare (e.g., 'final_performance')
         - confidence_level: level for uncertainty bands/intervals
+        - backend: "matplotlib" or "datashader"; datashader rasterizes the individual
+          run curves into one image once there are DATASHADER_MIN_POINTS points
+
+        A scalar per run gives a bar chart of run means; a sequence per run gives
+        per-episode curves with the mean on top; shorter runs are NaN-padded and
+        each episode is aggregated over the runs that reached it.
+        Intervals are percentile-bootstrap CIs of the mean across runs.
         """
-        raise NotImplementedError
+        if self.background:
+            return self._submit("plot_algorithm_comparison", results, metric=metric,
+                                confidence_level=confidence_level, backend=backend)
+        if backend not in ("matplotlib", "datashader"):
+            raise ValueError(f"Unsupported backend: {backend}")
+        curves = {algo: _runs_array(metrics[metric]) for algo, metrics in results.items()}
+        slots = [self._color_slot(algo) for algo in curves]
+        colors = [self._lut[i] for i in slots]
+        fig = self._new_figure((8, 5))
+        ax = fig.add_subplot()
+
+        if all(data.shape[1] == 1 for data in curves.values()):
+            means = np.empty(len(curves))
+            err = np.zeros((2, len(curves)))
+            for i, (mean, lo, hi) in enumerate(self._aggregate_many(list(curves.values()), confidence_level)):
+                means[i] = mean[0]
+                err[:, i] = mean[0] - lo[0], hi[0] - mean[0]
+            ax.bar(list(curves), means, yerr=err, color=colors, capsize=4)
+            ax.set_ylabel(metric)
+        else:
+            n_points = sum(data.size for data in curves.values())
+            shade = backend == "datashader" and ds is not None and n_points >= DATASHADER_MIN_POINTS
+            if shade:
+                _shade_runs(ax, curves, [self._lut_hex[i] for i in slots])
+            datas = list(curves.values())
+            aggregates = self._aggregate_many(datas, confidence_level)
+            # Artists are created on this thread: matplotlib objects aren't thread-safe
+            for algo, color, data, (mean, lo, hi) in zip(curves, colors, datas, aggregates):
+                x = np.arange(1, data.shape[1] + 1)
+                dense = x.shape[0] > RASTERIZE_MIN_POINTS
+                if not shade:
+                    # All runs as one artist; NaN padding breaks each run's path where it ends
+                    segments = np.stack((np.broadcast_to(x, data.shape), data), axis=-1)
+                    ax.add_collection(LineCollection(segments, colors=[color], linewidths=0.5, alpha=0.3,
+                                                     rasterized=dense))
+                ax.plot(x, mean, color=color, label=algo, rasterized=dense)
+                if data.shape[0] > 1:
+                    ax.fill_between(x, lo, hi, color=color, alpha=0.2, linewidth=0, rasterized=dense)
+            ax.set_xlabel("episode")
+            ax.set_ylabel(metric)
+            ax.legend()
+        self._figures[f"algorithm_comparison_{metric}"] = fig
 
     def plot_hyperparameter_sensitivity(
         self,
@@ -67,14 +588,304 @@ class Plotter:
         - results: maps param_name → { param_value_str → metric series or aggregate }
         - parameters: which hyperparameters to include
         - metric: which metric to visualize
+
+        A name in `parameters` gives a line panel: the mean (with a 95% bootstrap CI
+        when there are several runs) per value. A `(name_x, name_y)` pair gives a
+        heatmap of `results[(name_x, name_y)]`, whose keys are `(value_x, value_y)`;
+        an evenly spaced (or categorical) grid is drawn with `imshow`, any other
+        with `pcolorfast`.
+        """
+        if self.background:
+            return self._submit("plot_hyperparameter_sensitivity", results, parameters, metric=metric)
+        if not parameters:
+            raise ValueError("plot_hyperparameter_sensitivity needs at least one parameter")
+        fig = self._new_figure((5 * len(parameters), 4))
+        axes = fig.subplots(1, len(parameters), squeeze=False)[0]
+        for ax, param in zip(axes, parameters):
+            by_value = results[param]
+            if isinstance(param, tuple):
+                self._draw_sensitivity_grid(ax, param, by_value, metric)
+                continue
+            keys = list(by_value)
+            x, numeric = _axis_values(keys)
+            order = np.argsort(x, kind="stable")
+            aggregates = self._aggregate_many(
+                [np.asarray(by_value[keys[i]], dtype=np.float32).reshape(-1, 1) for i in order], 0.95
+            )
+            mean = np.array([m[0] for m, _, _ in aggregates])
+            err = np.array([[m[0] - lo[0] for m, lo, _ in aggregates], [hi[0] - m[0] for m, _, hi in aggregates]])
+            ax.errorbar(x[order], mean, yerr=err, marker="o", capsize=4)
+            if not numeric:
+                ax.set_xticks(x[order], [str(keys[i]) for i in order])
+            ax.set_xlabel(param)
+            ax.set_ylabel(metric)
+        self._figures[f"hyperparameter_sensitivity_{metric}"] = fig
+
+    def append_points(self, metric: str, values: Sequence[float], label: Optional[str] = None) -> None:
+        """Append new episode values to a live curve (backend="pyqtgraph" only).
+
+        Points are stored in a growable buffer and the curve is refreshed in place
+        with `setData` on views of it, so streaming from a training loop stays cheap.
+        """
+        if self._pg is None:
+            raise ValueError("append_points requires Plotter(backend='pyqtgraph')")
+        values = np.asarray(values, dtype=np.float32).ravel()
+        curve, data = self._live_curve(metric, label)
+        data.extend(np.arange(data.size + 1, data.size + values.size + 1), values)
+        curve.setData(x=data.x[:data.size], y=data.y[:data.size])
+        self._qt_app.processEvents()
+
+    def _live_curve(self, metric: str, label: Optional[str]) -> Tuple[Any, _GrowableSeries]:
+        entry = self._curves.get((metric, label))
+        if entry is None:
+            panel = self._panels.get(metric)
+            if panel is None:
+                panel = self._panels[metric] = self._layout.addPlot(row=len(self._panels), col=0, title=metric)
+                panel.addLegend()
+            curve = panel.plot(pen=self._pg.intColor(len(self._curves)), name=label)
+            # Draw only what is on screen, peak-downsampled to the view width
+            curve.setClipToView(True)
+            curve.setDownsampling(auto=True, method="peak")
+            entry = self._curves[(metric, label)] = (curve, _GrowableSeries())
+        return entry
+
+    @staticmethod
+    def save_run(path: str, values: Sequence[float]) -> None:
+        """Write one run's per-episode values as a raw float32 `.f32` file (see `open_run`)."""
+        np.ascontiguousarray(values, dtype=np.float32).tofile(os.fspath(path))
+
+    def open_run(self, path: str) -> np.memmap:
+        """Map a `.f32` run file read-only; pages are read from disk only when touched.
+
+        Maps are kept open across calls (and reopened when the file changes), so
+        runs plotted repeatedly stay in the page cache. The result can be passed
+        anywhere a per-episode sequence is accepted; float32 input is never copied
+        on the way in.
+        """
+        path = os.fspath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._mmaps.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = self._mmaps[path] = (stamp, np.memmap(path, dtype=np.float32, mode="r", shape=(st.st_size // 4,)))
+        return cached[1]
+
+    def load_results(self, paths: Sequence[str], cache_dir: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Load run logs (one per run; Logger JSON or CSV) as `{column: (n_runs, n_episodes) float32}`.
+
+        Columns are RUN_COLUMNS; shorter runs are NaN-padded. The result can be used
+        directly as `results[algo]` for `plot_algorithm_comparison`. With pyarrow
+        installed, each parsed log is cached as zstd Parquet under `cache_dir`
+        (default RESULTS_CACHE_DIR) until the log file changes.
         """
-        raise NotImplementedError
+        if not paths:
+            raise ValueError("load_results needs at least one log path")
+        cache_dir = cache_dir or RESULTS_CACHE_DIR
+        paths = [os.fspath(p) for p in paths]
+        if pa is not None and len(paths) > 1:
+            # pyarrow parses and decompresses without the GIL, so files load concurrently
+            with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as pool:
+                runs = list(pool.map(lambda p: _load_run(p, cache_dir), paths))
+        else:
+            runs = [_load_run(p, cache_dir) for p in paths]
+        return {col: _runs_array([run[col] for run in runs]) for col in RUN_COLUMNS}
 
     def save_plots(self, path: str, format: str = "png", dpi: int = 150) -> None:
         """Persist all currently prepared figures to disk.
 
         - path: directory to write figures into
         - format: file format extension (e.g., 'png', 'pdf')
-        - dpi: dots-per-inch for raster formats
+        - dpi: dots-per-inch for raster formats (and for rasterized dense lines in PDF/SVG)
+
+        Figures use constrained layout, which is solved within the save's single
+        draw, so no `tight_layout`/`bbox_inches="tight"` (each renders a second
+        time). In background mode this also stops the worker (a later plot call
+        starts a new one).
+        """
+        if self.background:
+            self._submit("save_plots", path, format=format, dpi=dpi)
+            self.close()
+            return
+        os.makedirs(path, exist_ok=True)
+        for name, fig in self._figures.items():
+            fig.savefig(os.path.join(path, f"{name}.{format}"), dpi=dpi, format=format)
+        for metric, panel in self._panels.items():
+            self._pg.exporters.ImageExporter(panel).export(os.path.join(path, f"live_{metric}.{format}"))
+
+    def figure_rgba(self, name: str) -> np.ndarray:
+        """Render figure `name` and return its (H, W, 4) uint8 pixels.
+
+        The array is a zero-copy view of the Agg buffer (valid until the next draw).
+        """
+        canvas = self._figures[name].canvas
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba())
+
+    def figure_png(self, name: str) -> bytes:
+        """Render figure `name` to PNG bytes (e.g. for notebooks or loggers)."""
+        buf = io.BytesIO()
+        mpl_image.imsave(buf, self.figure_rgba(name), format="png")
+        return buf.getvalue()
+
+    def close(self) -> None:
+        """Stop the background worker after it drains its queue; re-raise any drawing errors."""
+        if self._worker is None:
+            return
+        self._tasks.put(None)
+        self._worker.join()
+        failures = []
+        while not self._errors.empty():
+            failures.append(self._errors.get())
+        self._tasks = self._errors = self._worker = None
+        if failures:
+            raise RuntimeError("Background plotting failed:\n" + "\n".join(failures))
+
+    def _submit(self, kind: str, *args: Any, **kwargs: Any) -> None:
+        if self._worker is None:
+            ctx = mp.get_context("spawn")
+            self._tasks = ctx.Queue(maxsize=4)
+            self._errors = ctx.Queue()
+            self._worker = ctx.Process(target=_draw_loop, args=(self._tasks, self._errors, self.style),
+                                       name="plotter", daemon=True)
+            self._worker.start()
+        # put() only waits when the worker is 4 plots behind: backpressure instead of dropped plots
+        self._tasks.put((kind, _share(args), _share(kwargs)))
+
+    def clear_cache(self) -> None:
+        """Drop memoized aggregation results and downsampled curves."""
+        self._agg_cache.clear()
+        self._m4_cache.clear()
+        self._m4_cache_bytes = 0
+
+    def _aggregate(self, data: np.ndarray, confidence_level: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Mean and bootstrap CI over runs of (n_runs, n_episodes) `data`, memoized by content.
+
+        NaN entries (padding past a run's end) are skipped. Re-plotting identical
+        run data (e.g. only the style or labels changed) is a cache hit, returning
+        the cached arrays themselves, so callers must not modify them.
         """
-        raise NotImplementedError
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        key = (_digest(data), data.shape, float(confidence_level))
+        with self._agg_lock:
+            hit = self._agg_cache.get(key)
+            if hit is not None:
+                self._agg_cache.move_to_end(key)
+                return hit
+        # One fused pass writes mean/lo/hi straight into the array that is cached and plotted
+        hit = tuple(aggregate(data, N_BOOTSTRAP, confidence_level))
+        with self._agg_lock:
+            self._agg_cache[key] = hit
+            if len(self._agg_cache) > AGG_CACHE_SIZE:
+                self._agg_cache.popitem(last=False)
+        return hit
+
+    def _aggregate_many(self, datas: Sequence[np.ndarray], confidence_level: float) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """`_aggregate` each array; with the NumPy kernels, one thread per array.
+
+        The Numba kernels already spread each array over a prange team, and
+        concurrent launches from several threads would oversubscribe the cores
+        (and abort under the non-threadsafe `workqueue` threading layer), so they
+        run serially.
+        """
+        if len(datas) < 2 or NUMBA_AVAILABLE:
+            return [self._aggregate(d, confidence_level) for d in datas]
+        with ThreadPoolExecutor(max_workers=min(len(datas), os.cpu_count() or 1)) as pool:
+            return list(pool.map(lambda d: self._aggregate(d, confidence_level), datas))
+
+    def _m4_series(self, y: np.ndarray, window: int, width_px: int) -> np.ndarray:
+        """Smoothed `y` M4-downsampled to `width_px` columns, as a (3, n) float32 (x, mean, std).
+
+        Same pixels at O(width) points; the band shares the mean's indices. Results
+        are cached compressed, so re-plotting the same series at the same width
+        skips smoothing and downsampling.
+        """
+        key = (_digest(np.ascontiguousarray(y)), window, width_px)
+        blob = self._m4_cache.get(key)
+        if blob is not None:
+            self._m4_cache.move_to_end(key)
+            return np.frombuffer(_decompress(blob), dtype=np.float32).reshape(3, -1)
+        mean, std = rolling_mean_std(y, window)
+        x = np.arange(window, y.shape[0] + 1)
+        idx = _m4_downsample(x, mean, width_px)
+        packed = np.stack((x[idx], mean[idx], std[idx])).astype(np.float32)
+        blob = _compress(packed.tobytes())
+        self._m4_cache[key] = blob
+        self._m4_cache_bytes += len(blob)
+        while self._m4_cache_bytes > M4_CACHE_BYTES and len(self._m4_cache) > 1:
+            self._m4_cache_bytes -= len(self._m4_cache.popitem(last=False)[1])
+        return packed
+
+    def _color_slot(self, algo: str) -> int:
+        """Palette index for `algo`, assigned in first-seen order and then fixed."""
+        slot = self._algo_colors.get(algo)
+        if slot is None:
+            slot = self._algo_colors[algo] = len(self._algo_colors) % len(self._lut)
+        return slot
+
+    def _norm(self, vmin: float, vmax: float) -> mpl_colors.Normalize:
+        norm = self._norms.get((vmin, vmax))
+        if norm is None:
+            norm = self._norms[(vmin, vmax)] = mpl_colors.Normalize(vmin, vmax)
+        return norm
+
+    def _set_curve(self, ax: Any, key: Tuple[str, str], x: np.ndarray, y: np.ndarray,
+                   band: Optional[Tuple[np.ndarray, np.ndarray]], label: Optional[str], rasterized: bool) -> None:
+        """Create the (line, band) artists for `key`, or update the existing ones in place."""
+        line, fill = self._lines.get(key, (None, None))
+        reused = line is not None
+        if reused:
+            line.set_data(x, y)
+            line.set_rasterized(rasterized)
+        else:
+            (line,) = ax.plot(x, y, label=label, rasterized=rasterized)
+        if band is None:
+            if fill is not None:
+                fill.remove()
+                fill = None
+        elif fill is None:
+            fill = ax.fill_between(x, *band, color=line.get_color(), alpha=0.2, linewidth=0, rasterized=rasterized)
+        else:
+            fill.set_data(x, *band)
+            fill.set_rasterized(rasterized)
+        self._lines[key] = (line, fill)
+        if reused:
+            # relim() only sees lines; the band's extent is added explicitly
+            ax.relim()
+            if band is not None:
+                ax.update_datalim(np.column_stack((np.concatenate((x, x)), np.concatenate(band))))
+            ax.autoscale_view()
+
+    def _draw_sensitivity_grid(self, ax: Any, names: Tuple[str, str],
+                               by_value: Mapping[Tuple[Any, Any], Any], metric: str) -> None:
+        xs = list(dict.fromkeys(k[0] for k in by_value))
+        ys = list(dict.fromkeys(k[1] for k in by_value))
+        x, x_numeric = _axis_values(xs)
+        y, y_numeric = _axis_values(ys)
+        x_order, y_order = np.argsort(x, kind="stable"), np.argsort(y, kind="stable")
+        x_pos = {xs[i]: j for j, i in enumerate(x_order)}
+        y_pos = {ys[i]: j for j, i in enumerate(y_order)}
+        x, y = x[x_order], y[y_order]
+        # Contiguous float32 so the rasterizer gets the grid in one copy; NaN marks missing cells
+        grid = np.full((y.size, x.size), np.nan, dtype=np.float32)
+        for (vx, vy), values in by_value.items():
+            grid[y_pos[vy], x_pos[vx]] = np.mean(values)
+        x_edges, y_edges = _cell_edges(x), _cell_edges(y)
+        regular = all(e.size < 3 or np.allclose(np.diff(e), e[1] - e[0]) for e in (x_edges, y_edges))
+        norm = self._norm(float(np.nanmin(grid)), float(np.nanmax(grid)))
+        if regular:
+            image = ax.imshow(grid, aspect="auto", origin="lower", interpolation="nearest", norm=norm,
+                              extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+        else:
+            image = ax.pcolorfast(x_edges, y_edges, grid, norm=norm)
+        if not x_numeric:
+            ax.set_xticks(x, [str(xs[i]) for i in x_order])
+        if not y_numeric:
+            ax.set_yticks(y, [str(ys[i]) for i in y_order])
+        ax.set_xlabel(names[0])
+        ax.set_ylabel(names[1])
+        ax.figure.colorbar(image, ax=ax, label=metric)
+
+    def _new_figure(self, figsize: Tuple[float, float]) -> Figure:
+        fig = Figure(figsize=figsize, layout="constrained")
+        FigureCanvasAgg(fig)
+        return fig
@@ -0,0 +1,37 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+import torch
+
+from src.agents.build_agent import build_agent
+from src.utils.config import ConfigManager
+
+
+def _random_agent(env):
+    config = ConfigManager("configs").defaults
+    return build_agent(env, {**config, "algorithm": {"type": "random"}})
+
+
+@pytest.fixture
+def cartpole():
+    env = gym.make("CartPole-v1")
+    yield env
+    env.close()
+
+
+def test_single_discrete_action_is_int(cartpole):
+    agent = _random_agent(cartpole)
+    action, _ = agent._postprocess_action(torch.tensor([1]), {})
+    assert action == 1 and isinstance(action, int)
+
+
+def test_batched_actions_stay_arrays_with_one_env(cartpole):
+    agent = _random_agent(cartpole)
+    actions, _ = agent._postprocess_action(torch.tensor([1]), {}, batched=True)
+    assert isinstance(actions, np.ndarray)
+    assert actions.shape == (1,)
+
+
+def test_random_agent_defaults_to_cpu(cartpole):
+    agent = _random_agent(cartpole)
+    assert agent.device == torch.device("cpu")
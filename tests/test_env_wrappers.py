@@ -0,0 +1,99 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium.spaces import Box, Discrete
+
+from src.env_wrappers import EnvironmentFactory, FrameStack, NormalizeObservations, NormalizeRewards
+
+
+class _SequenceEnv(gym.Env):
+    """Replays fixed observations and rewards, one per step."""
+
+    def __init__(self, observations, rewards, dtype=np.float32):
+        # Observations are returned as `dtype`; the declared space is always float32
+        self._obs = np.asarray(observations, dtype=dtype)
+        self._rewards = list(rewards)
+        self._t = 0
+        self.observation_space = Box(-np.inf, np.inf, shape=self._obs.shape[1:], dtype=np.float32)
+        self.action_space = Discrete(2)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        self._t = 0
+        return self._obs[0], {}
+
+    def step(self, action):
+        self._t += 1
+        done = self._t >= len(self._rewards)
+        return self._obs[self._t], self._rewards[self._t - 1], done, False, {}
+
+
+def _data(n=50, dim=3, seed=0):
+    rng = np.random.default_rng(seed)
+    obs = rng.normal(5.0, 3.0, size=(n + 1, dim)).astype(np.float32)
+    rewards = rng.normal(-2.0, 0.5, size=n)
+    return obs, rewards
+
+
+def test_normalize_observations_welford_matches_reference():
+    obs, rewards = _data()
+    env = NormalizeObservations(_SequenceEnv(obs, rewards), {})
+    env.reset()
+    for _ in range(len(rewards)):
+        env.step(0)
+    seen = obs[1:].astype(np.float64)
+    assert env.count == len(seen)
+    np.testing.assert_allclose(env.running_mean, seen.mean(axis=0), rtol=1e-10)
+    np.testing.assert_allclose(env.running_std, seen.std(axis=0, ddof=1), rtol=1e-5)
+
+
+def test_normalize_observations_deferred_matches_per_step():
+    obs, rewards = _data()
+    eager = NormalizeObservations(_SequenceEnv(obs, rewards), {})
+    deferred = NormalizeObservations(_SequenceEnv(obs, rewards), {"deferred_stats": True})
+    for env in (eager, deferred):
+        env.reset()
+        for _ in range(len(rewards)):
+            env.step(0)
+    deferred.flush_stats()
+    assert deferred.count == eager.count
+    np.testing.assert_allclose(deferred.running_mean, eager.running_mean, rtol=1e-10)
+    np.testing.assert_allclose(deferred.running_std, eager.running_std, rtol=1e-5)
+
+
+def test_normalize_rewards_welford_matches_reference():
+    obs, rewards = _data()
+    env = NormalizeRewards(_SequenceEnv(obs, rewards), {})
+    env.reset()
+    for _ in range(len(rewards)):
+        env.step(0)
+    assert env.count == len(rewards)
+    assert env.running_mean == pytest.approx(rewards.mean(), rel=1e-10)
+    assert env.running_std == pytest.approx(rewards.std(ddof=1), rel=1e-10)
+
+
+def test_normalize_observations_rejects_momentum():
+    config = {"environment": {"wrappers": {"normalize_observations": {"enabled": True, "momentum": 0.99}}}}
+    with pytest.raises(ValueError, match="momentum"):
+        EnvironmentFactory()._validate_config(config, "CartPole-v1")
+
+
+def test_frame_stack_orders_frames_oldest_first():
+    obs = np.arange(6, dtype=np.float32).reshape(6, 1)
+    env = FrameStack(_SequenceEnv(obs, np.zeros(5)), {"frame_stack": 3})
+    stacked, _ = env.reset()
+    np.testing.assert_array_equal(stacked[:, 0], [0, 0, 0])
+    for t in range(1, 5):
+        stacked, *_ = env.step(0)
+    np.testing.assert_array_equal(stacked[:, 0], [2, 3, 4])
+    assert env.observation_space.shape == (3, 1)
+
+
+@pytest.mark.parametrize("copy_obs", [True, False])
+def test_frame_stack_keeps_observation_dtype(copy_obs):
+    obs = np.linspace(0.0, 1.0, 12).reshape(4, 3) + 1e-9
+    env = FrameStack(_SequenceEnv(obs, np.zeros(3), dtype=np.float64), {"frame_stack": 2, "copy_obs": copy_obs})
+    stacked, _ = env.reset()
+    assert stacked.dtype == np.float64
+    stacked, *_ = env.step(0)
+    np.testing.assert_array_equal(stacked, obs[:2])
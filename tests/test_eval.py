@@ -0,0 +1,34 @@
+import pytest
+
+from src.env_wrappers import EnvironmentFactory
+from src.utils.eval import flush_env_stats, set_env_training_mode
+
+
+def _vector_env(vector_mode, wrappers):
+    config = {"environment": {"num_envs": 2, "vector_mode": vector_mode, "wrappers": wrappers}}
+    return EnvironmentFactory().create_env("CartPole-v1", config)
+
+
+@pytest.mark.parametrize("vector_mode", ["sync", "async"])
+def test_training_mode_without_wrappers(vector_mode):
+    env = _vector_env(vector_mode, {})
+    try:
+        env.reset(seed=0)
+        set_env_training_mode(env, False)
+        flush_env_stats(env)
+        set_env_training_mode(env, True)
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize("vector_mode", ["sync", "async"])
+def test_training_mode_reaches_wrappers(vector_mode):
+    env = _vector_env(vector_mode, {"normalize_observations": {"enabled": True}})
+    try:
+        env.reset(seed=0)
+        set_env_training_mode(env, False)
+        assert not any(env.get_attr("training"))
+        set_env_training_mode(env, True)
+        assert all(env.get_attr("training"))
+    finally:
+        env.close()
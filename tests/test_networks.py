@@ -0,0 +1,15 @@
+import torch
+
+from src.networks.policy import PolicyNetwork
+
+
+def test_policy_get_action_follows_caller_grad_mode():
+    net = PolicyNetwork(4, 16, 2)
+    obs = torch.zeros(3, 4)
+    action, log_prob = net.get_action(obs)
+    assert action.shape == (3,) and log_prob.shape == (3,)
+    assert not log_prob.is_inference()
+    assert log_prob.requires_grad
+    with torch.inference_mode():
+        _, log_prob = net.get_action(obs)
+    assert log_prob.is_inference()
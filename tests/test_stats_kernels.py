@@ -0,0 +1,65 @@
+import numpy as np
+
+import pytest
+
+from src.utils._stats_kernels import UNROLL_MAX_RUNS, _aggregate_jit, _aggregate_kernel, _aggregate_np, aggregate
+
+# Runs that ended early are NaN-padded on the right
+PADDED_RUNS = np.array([[1, 2, 3, 4], [3, 4, np.nan, np.nan], [5, 6, 7, np.nan]], dtype=np.float32)
+
+
+def _padded_runs(n_runs, n_episodes=40, seed=0):
+    rng = np.random.default_rng(seed)
+    runs = rng.normal(size=(n_runs, n_episodes)).astype(np.float32)
+    for r, length in enumerate(rng.integers(1, n_episodes + 1, size=n_runs)):
+        runs[r, length:] = np.nan
+    runs[0] = rng.normal(size=n_episodes)  # at least one run covers every episode
+    return runs
+
+
+def _run(kernel, runs, n_boot=200, level=0.9, seed=0):
+    idx = np.random.default_rng(seed).integers(0, runs.shape[0], size=(n_boot, runs.shape[0]), dtype=np.int32)
+    out = np.empty((3, runs.shape[1]), dtype=np.float64)
+    kernel(np.ascontiguousarray(runs), idx, level, out)
+    return out
+
+
+def test_generic_kernel_skips_padding():
+    out = _run(_aggregate_jit, PADDED_RUNS)
+    np.testing.assert_allclose(out[0], [3, 4, 5, 4])
+    assert out[2, 3] == 4 and out[1, 3] == 4
+    np.testing.assert_allclose(out, _run(_aggregate_np, PADDED_RUNS), rtol=1e-6)
+
+
+def test_generic_kernel_matches_numpy_on_padded_runs():
+    runs = _padded_runs(12)
+    np.testing.assert_allclose(_run(_aggregate_jit, runs), _run(_aggregate_np, runs), rtol=1e-6)
+
+
+@pytest.mark.parametrize("n_runs", [1, 12])
+def test_aggregate_matches_numpy(n_runs):
+    runs = _padded_runs(n_runs)
+    expected = _run(_aggregate_np, runs)
+    np.testing.assert_allclose(aggregate(runs, 200, 0.9), expected, rtol=1e-6)
+
+
+def test_aggregate_writes_into_out():
+    runs = _padded_runs(12)
+    out = np.full((3, runs.shape[1]), -1.0)
+    assert aggregate(runs, 200, 0.9, out=out) is out
+    np.testing.assert_allclose(out, _run(_aggregate_np, runs), rtol=1e-6)
+    np.testing.assert_array_equal(out[1] <= out[2], True)
+
+
+@pytest.mark.parametrize("n_runs", range(2, UNROLL_MAX_RUNS + 1))
+def test_unrolled_kernels_match_numpy(n_runs):
+    runs = _padded_runs(n_runs, seed=n_runs)
+    expected = _run(_aggregate_np, runs)
+    np.testing.assert_allclose(_run(_aggregate_kernel(n_runs), runs), expected, rtol=1e-6)
+    np.testing.assert_allclose(aggregate(runs, 200, 0.9), expected, rtol=1e-6)
+
+
+def test_unrolled_kernel_skips_padding():
+    out = _run(_aggregate_kernel(PADDED_RUNS.shape[0]), PADDED_RUNS)
+    np.testing.assert_allclose(out[0], [3, 4, 5, 4])
+    np.testing.assert_allclose(out, _run(_aggregate_np, PADDED_RUNS), rtol=1e-6)
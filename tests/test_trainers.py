@@ -0,0 +1,94 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+from src.runners.trainer import Trainer
+from src.utils.buffer import ReplayBuffer
+
+
+class _RecordingAgent:
+    """Always pushes left and records the observation batches it is shown."""
+
+    def __init__(self):
+        self.batches = []
+
+    def set_mode(self, training):
+        pass
+
+    def select_action(self, obs):
+        return 0, None
+
+    def select_actions(self, obs):
+        self.batches.append(np.array(obs))
+        return np.zeros(len(obs), dtype=np.int64), None
+
+
+class _EvalOnlyTrainer(Trainer):
+    def train_episode(self, episode_index):
+        raise NotImplementedError
+
+
+def test_batched_eval_copies_play_distinct_episodes():
+    env = gym.make("CartPole-v1")
+    env.reset(seed=0)
+    agent = _RecordingAgent()
+    trainer = _EvalOnlyTrainer(agent, env, {"evaluation": {"num_envs": 3}})
+    metrics = trainer.evaluate(3)
+    first = agent.batches[0]
+    assert first.shape[0] == 3
+    assert len({row.tobytes() for row in first}) == 3
+    assert metrics["length_mean"] > 0
+    env.close()
+
+
+def _off_policy_trainer():
+    from src.runners.off_policy_trainer import OffPolicyTrainer
+
+    config = {"replay_buffer": {"prefetch_depth": 2}, "training": {"batch_size": 8}}
+    return OffPolicyTrainer(_RecordingAgent(), None, config)
+
+
+def test_next_batch_waits_for_ready_buffer():
+    trainer = _off_policy_trainer()
+    buffer = ReplayBuffer(max_size=64, min_size=16, obs_shape=(4,), seed=0)
+    with pytest.raises(ValueError):
+        trainer.next_batch(buffer)
+    assert trainer._prefetcher is None
+    for i in range(16):
+        buffer.add(np.zeros(4, dtype=np.float32), 0, 0.0, np.zeros(4, dtype=np.float32), False)
+    assert trainer.next_batch(buffer)["obs"].shape == (8, 4)
+    assert trainer._prefetcher is not None
+    trainer.close()
+
+
+def test_next_batch_recovers_after_sampling_error():
+    trainer = _off_policy_trainer()
+    buffer = ReplayBuffer(max_size=64, min_size=16, obs_shape=(4,), seed=0)
+    for i in range(16):
+        buffer.add(np.zeros(4, dtype=np.float32), 0, 0.0, np.zeros(4, dtype=np.float32), False)
+    trainer.next_batch(buffer)
+    buffer.clear()
+    with pytest.raises(ValueError):
+        # Batches queued before the clear may still come out first
+        for _ in range(4):
+            trainer.next_batch(buffer)
+    assert trainer._prefetcher is None
+    for i in range(16):
+        buffer.add(np.zeros(4, dtype=np.float32), 0, 0.0, np.zeros(4, dtype=np.float32), False)
+    assert trainer.next_batch(buffer)["obs"].shape == (8, 4)
+    trainer.close()
+
+
+def test_next_batch_follows_buffer_changes():
+    trainer = _off_policy_trainer()
+    first = ReplayBuffer(max_size=64, obs_shape=(4,), seed=0)
+    second = ReplayBuffer(max_size=64, obs_shape=(4,), seed=0)
+    for i in range(16):
+        first.add(np.zeros(4, dtype=np.float32), 0, 0.0, np.zeros(4, dtype=np.float32), False)
+        second.add(np.ones(4, dtype=np.float32), 1, 1.0, np.ones(4, dtype=np.float32), False)
+    assert trainer.next_batch(first)["rewards"].eq(0).all()
+    prefetcher = trainer._prefetcher
+    assert trainer.next_batch(second)["rewards"].eq(1).all()
+    assert trainer._prefetcher is not prefetcher
+    assert trainer._prefetcher.serves(second, "cpu")
+    trainer.close()